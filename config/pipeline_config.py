@@ -134,9 +134,8 @@ SCHEDULING_CONFIG = {
     # Maximum defer window (hours)
     "max_defer_hours": int(os.environ.get("MAX_DEFER_HOURS", "24")),
     
-    # Retry configuration
+    # Retry configuration (total attempts per AWS call, backoff is botocore's)
     "max_retries": int(os.environ.get("PIPELINE_MAX_RETRIES", "3")),
-    "retry_delay_seconds": int(os.environ.get("PIPELINE_RETRY_DELAY", "5")),
 }
 
 # ============================================================================
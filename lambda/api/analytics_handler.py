@@ -11,6 +11,8 @@ from decimal import Decimal
 import logging
 from typing import Dict, List
 
+from pipeline_storage import decode_json_attributes
+
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
@@ -246,7 +248,7 @@ def get_pipeline_analytics(pipeline_name: str, days: int = 30) -> Dict:
                 'last_7_days_carbon': round(recent_carbon, 2),
                 'last_7_days_executions': len(recent_executions)
             },
-            'recent_executions': executions[:10]  # Last 10 executions
+            'recent_executions': [decode_json_attributes(e) for e in executions[:10]]  # Last 10 executions
         }
         
     except Exception as e:
@@ -8,6 +8,7 @@ to DynamoDB for analytics and reporting.
 import boto3
 import json
 import os
+import time
 from datetime import datetime, timezone, timedelta
 from decimal import Decimal
 from typing import Dict, List, Optional
@@ -15,6 +16,30 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# DynamoDB BatchWriteItem accepts at most 25 put/delete requests per call
+BATCH_WRITE_LIMIT = 25
+
+# Execution record attributes written as pre-encoded JSON strings, mapped to
+# where the decoded value lived in the record before it was encoded
+JSON_ENCODED_ATTRIBUTES = {
+    'build_summaries_json': ('resource_usage', 'build_summaries'),
+    'pipeline_structure_json': ('pipeline_structure',),
+    'commit_details_json': ('commit_details',),
+    'trigger_details_json': ('trigger_details',),
+}
+
+
+def decode_json_attributes(item: Dict) -> Dict:
+    """Expand pre-encoded JSON attributes of an execution record back into nested values"""
+    for encoded_key, path in JSON_ENCODED_ATTRIBUTES.items():
+        if encoded_key in item:
+            parent = item
+            for key in path[:-1]:
+                parent = parent.setdefault(key, {})
+            parent[path[-1]] = json.loads(item.pop(encoded_key))
+    return item
+
+
 class PipelineDataStore:
     """Handles storage of pipeline execution data and carbon analytics"""
     
@@ -44,11 +69,7 @@ class PipelineDataStore:
             bool: Success status
         """
         try:
-            # Convert floats to Decimal for DynamoDB
-            execution_item = self._convert_to_dynamodb_format(execution_data)
-            
-            # Add TTL (1 year from now)
-            execution_item['ttl'] = int((datetime.now() + timedelta(days=365)).timestamp())
+            execution_item = self._build_execution_item(execution_data)
             
             # Store execution record
             self.executions.put_item(Item=execution_item)
@@ -72,29 +93,9 @@ class PipelineDataStore:
             bool: Success status
         """
         try:
-            timestamp_int = int(timestamp.timestamp())
-            ttl = int((timestamp + timedelta(days=30)).timestamp())
-            
             # Store each region's data
             with self.carbon_history.batch_writer() as batch:
-                for region, data in regional_data.items():
-                    item = {
-                        'region': region,
-                        'timestamp': timestamp_int,
-                        'intensity': Decimal(str(data.get('intensity', 0))),
-                        'source': data.get('source', 'unknown'),
-                        'is_realtime': data.get('is_realtime', False),
-                        'ttl': ttl
-                    }
-                    
-                    # Add additional fields if available
-                    if 'grid_intensity' in data:
-                        item['grid_intensity'] = Decimal(str(data['grid_intensity']))
-                    if 'renewable_pct' in data:
-                        item['renewable_pct'] = Decimal(str(data['renewable_pct']))
-                    if 'index' in data:
-                        item['index'] = data['index']
-                    
+                for item in self._build_carbon_snapshot_items(regional_data, timestamp):
                     batch.put_item(Item=item)
             
             logger.info(f"Stored carbon intensity for {len(regional_data)} regions")
@@ -192,63 +193,12 @@ class PipelineDataStore:
             bool: Success status
         """
         try:
-            date_str = timestamp.strftime('%Y-%m-%d')
-            hour = timestamp.hour
-            
-            # Create rankings
-            rankings = []
-            intensities = []
-            
-            for region, data in regional_data.items():
-                intensity = data.get('intensity', 0)
-                rankings.append({
-                    'region': region,
-                    'intensity': intensity,
-                    'rank': 0  # Will be set after sorting
-                })
-                intensities.append(intensity)
-            
-            # Sort by intensity and assign ranks
-            rankings.sort(key=lambda x: x['intensity'])
-            for i, ranking in enumerate(rankings):
-                ranking['rank'] = i + 1
-            
-            # Calculate optimization opportunities
-            min_intensity = min(intensities) if intensities else 0
-            max_intensity = max(intensities) if intensities else 0
-            
-            max_savings_percent = 0
-            if max_intensity > 0:
-                max_savings_percent = ((max_intensity - min_intensity) / max_intensity) * 100
-            
-            # Count regions below threshold (50 gCO2/kWh)
-            regions_below_threshold = [r['region'] for r in rankings if r['intensity'] <= 50]
-            
-            insights_item = {
-                'date': date_str,
-                'hour': hour,
-                'rankings': rankings,
-                'opportunities': {
-                    'max_savings_percent': Decimal(str(round(max_savings_percent, 1))),
-                    'best_region': rankings[0]['region'] if rankings else '',
-                    'worst_region': rankings[-1]['region'] if rankings else '',
-                    'regions_below_threshold': regions_below_threshold
-                },
-                'data_quality': {
-                    'regions_with_data': len(regional_data),
-                    'data_freshness_minutes': 5  # Assuming 5-minute freshness
-                },
-                'created_at': timestamp.isoformat(),
-                'ttl': int((timestamp + timedelta(days=60)).timestamp())
-            }
-            
-            # Convert to DynamoDB format
-            insights_item = self._convert_to_dynamodb_format(insights_item)
+            insights_item = self._build_regional_insights_item(regional_data, timestamp)
             
             # Store insights
             self.insights.put_item(Item=insights_item)
             
-            logger.info(f"Stored regional insights for {date_str} hour {hour}")
+            logger.info(f"Stored regional insights for {insights_item['date']} hour {insights_item['hour']}")
             return True
             
         except Exception as e:
@@ -275,7 +225,7 @@ class PipelineDataStore:
                 Limit=limit
             )
             
-            return response.get('Items', [])
+            return [decode_json_attributes(item) for item in response.get('Items', [])]
             
         except Exception as e:
             logger.error(f"Failed to get pipeline history: {e}")
@@ -311,9 +261,149 @@ class PipelineDataStore:
             logger.error(f"Failed to get carbon trends: {e}")
             return []
     
+    def batch_write_items(self, items_by_table: Dict[str, List[Dict]], max_retries: int = 5) -> bool:
+        """
+        Write items to one or more tables using BatchWriteItem
+        
+        Requests are chunked at the 25-item API limit and any
+        UnprocessedItems (throttling) are resubmitted with backoff.
+        
+        Args:
+            items_by_table: Dictionary of table name -> items to put
+            max_retries: Retries per chunk for unprocessed items
+            
+        Returns:
+            bool: Success status
+        """
+        try:
+            put_requests = [
+                (table_name, {'PutRequest': {'Item': item}})
+                for table_name, items in items_by_table.items()
+                for item in items
+            ]
+            
+            for start in range(0, len(put_requests), BATCH_WRITE_LIMIT):
+                request_items = {}
+                for table_name, request in put_requests[start:start + BATCH_WRITE_LIMIT]:
+                    request_items.setdefault(table_name, []).append(request)
+                
+                attempt = 0
+                while request_items:
+                    response = self.dynamodb.batch_write_item(RequestItems=request_items)
+                    request_items = response.get('UnprocessedItems')
+                    
+                    if request_items:
+                        attempt += 1
+                        if attempt > max_retries:
+                            logger.error(f"Batch write left unprocessed items after {max_retries} retries")
+                            return False
+                        time.sleep(min(0.05 * (2 ** attempt), 1.0))
+            
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to batch write items: {e}")
+            return False
+    
+    def _build_execution_item(self, execution_data: Dict) -> Dict:
+        """Build the DynamoDB item for an execution record"""
+        # Convert floats to Decimal for DynamoDB
+        execution_item = self._convert_to_dynamodb_format(execution_data)
+        
+        # Add TTL (1 year from now)
+        execution_item['ttl'] = int((datetime.now() + timedelta(days=365)).timestamp())
+        
+        return execution_item
+    
+    def _build_carbon_snapshot_items(self, regional_data: Dict, timestamp: datetime) -> List[Dict]:
+        """Build one carbon history item per region"""
+        timestamp_int = int(timestamp.timestamp())
+        ttl = int((timestamp + timedelta(days=30)).timestamp())
+        
+        items = []
+        for region, data in regional_data.items():
+            item = {
+                'region': region,
+                'timestamp': timestamp_int,
+                'intensity': Decimal(str(data.get('intensity', 0))),
+                'source': data.get('source', 'unknown'),
+                'is_realtime': data.get('is_realtime', False),
+                'ttl': ttl
+            }
+            
+            # Add additional fields if available
+            if 'grid_intensity' in data:
+                item['grid_intensity'] = Decimal(str(data['grid_intensity']))
+            if 'renewable_pct' in data:
+                item['renewable_pct'] = Decimal(str(data['renewable_pct']))
+            if 'index' in data:
+                item['index'] = data['index']
+            
+            items.append(item)
+        
+        return items
+    
+    def _build_regional_insights_item(self, regional_data: Dict, timestamp: datetime) -> Dict:
+        """Build the hourly regional insights item"""
+        date_str = timestamp.strftime('%Y-%m-%d')
+        hour = timestamp.hour
+        
+        # Create rankings
+        rankings = []
+        intensities = []
+        
+        for region, data in regional_data.items():
+            intensity = data.get('intensity', 0)
+            rankings.append({
+                'region': region,
+                'intensity': intensity,
+                'rank': 0  # Will be set after sorting
+            })
+            intensities.append(intensity)
+        
+        # Sort by intensity and assign ranks
+        rankings.sort(key=lambda x: x['intensity'])
+        for i, ranking in enumerate(rankings):
+            ranking['rank'] = i + 1
+        
+        # Calculate optimization opportunities
+        min_intensity = min(intensities) if intensities else 0
+        max_intensity = max(intensities) if intensities else 0
+        
+        max_savings_percent = 0
+        if max_intensity > 0:
+            max_savings_percent = ((max_intensity - min_intensity) / max_intensity) * 100
+        
+        # Count regions below threshold (50 gCO2/kWh)
+        regions_below_threshold = [r['region'] for r in rankings if r['intensity'] <= 50]
+        
+        insights_item = {
+            'date': date_str,
+            'hour': hour,
+            'rankings': rankings,
+            'opportunities': {
+                'max_savings_percent': Decimal(str(round(max_savings_percent, 1))),
+                'best_region': rankings[0]['region'] if rankings else '',
+                'worst_region': rankings[-1]['region'] if rankings else '',
+                'regions_below_threshold': regions_below_threshold
+            },
+            'data_quality': {
+                'regions_with_data': len(regional_data),
+                'data_freshness_minutes': 5  # Assuming 5-minute freshness
+            },
+            'created_at': timestamp.isoformat(),
+            'ttl': int((timestamp + timedelta(days=60)).timestamp())
+        }
+        
+        # Convert to DynamoDB format
+        return self._convert_to_dynamodb_format(insights_item)
+    
     def _convert_to_dynamodb_format(self, data: Dict) -> Dict:
         """Convert Python types to DynamoDB-compatible types"""
-        if isinstance(data, dict):
+        if isinstance(data, (str, int, Decimal)):
+            # Already DynamoDB-compatible (covers bool, an int subclass)
+            return data
+        elif isinstance(data, dict):
             return {k: self._convert_to_dynamodb_format(v) for k, v in data.items()}
         elif isinstance(data, list):
             return [self._convert_to_dynamodb_format(item) for item in data]
@@ -328,24 +418,31 @@ def store_pipeline_execution_data(execution_data: Dict) -> bool:
     """Store pipeline execution data - called from test_real_pipeline.py"""
     store = PipelineDataStore()
     
-    # Store main execution record
-    success = store.store_pipeline_execution(execution_data)
-    
-    if success:
-        # Store carbon intensity snapshot
+    # Execution record, carbon intensity snapshot and regional insights are
+    # written together so a completion costs ceil(N/25) round-trips, not N + 2
+    try:
+        items_by_table = {
+            store.executions_table: [store._build_execution_item(execution_data)]
+        }
+        
         regional_data = execution_data.get('regional_snapshot', {})
         if regional_data:
             timestamp = datetime.fromisoformat(execution_data['created_at'].replace('Z', '+00:00'))
-            store.store_carbon_intensity_snapshot(regional_data, timestamp)
+            items_by_table[store.carbon_history_table] = store._build_carbon_snapshot_items(regional_data, timestamp)
+            items_by_table[store.insights_table] = [store._build_regional_insights_item(regional_data, timestamp)]
+    except Exception as e:
+        logger.error(f"Failed to prepare pipeline execution items: {e}")
+        return False
+    
+    success = store.batch_write_items(items_by_table)
+    
+    if success:
+        logger.info(f"Stored pipeline execution: {execution_data['execution_id']}")
         
-        # Update daily analytics
+        # Update daily analytics (read-modify-write, so it cannot be batched)
         pipeline_name = execution_data.get('pipeline_name', '')
         if pipeline_name:
             store.update_daily_analytics(pipeline_name, execution_data)
-        
-        # Store regional insights
-        if regional_data:
-            store.store_regional_insights(regional_data, timestamp)
     
     return success
 
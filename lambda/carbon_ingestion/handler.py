@@ -21,6 +21,7 @@ import boto3
 import json
 import os
 import logging
+import struct
 from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import Dict, List, Optional, Tuple
@@ -37,6 +38,11 @@ logger.setLevel(logging.INFO)
 
 TABLE_NAME = os.environ.get('DYNAMODB_TABLE', 'green_qa_carbon_intensity')
 
+# Each region's latest reading is also written under this sort key so readers
+# can fetch many regions with one BatchGetItem. Readers that pick the newest
+# timestamp per region never select it over a real reading.
+LATEST_MARKER_TIMESTAMP = 0
+
 # Cloud Carbon Footprint PUE Values
 # Source: https://www.cloudcarbonfootprint.org/docs/methodology/#power-usage-effectiveness-pue
 # AWS Sustainability Report: https://sustainability.aboutamazon.com/2024-amazon-sustainability-report-aws-summary.pdf
@@ -560,12 +566,33 @@ def store_carbon_data(region: str, data: Dict) -> None:
     if data.get('generation_mix'):
         item['generation_mix'] = data['generation_mix']
     if data.get('forecast'):
-        item['forecast'] = json.dumps(data['forecast'][:48])
+        forecast = data['forecast'][:48]
+        item['forecast'] = json.dumps(forecast)
+        item.update(_compact_forecast(forecast))
     
-    table.put_item(Item=item)
+    # Write the reading and the region's latest marker in one request
+    with table.batch_writer() as batch:
+        batch.put_item(Item=item)
+        batch.put_item(Item={**item, 'timestamp': LATEST_MARKER_TIMESTAMP, 'updated_at': timestamp})
     logger.info(f"Stored: {region} = {data['intensity']} gCO2/kWh ({data['source']})")
 
 
+def _compact_forecast(forecast: List[Dict]) -> Dict:
+    """
+    Compact copy of the forecast for the schedule optimizer: intensities packed
+    as little-endian float64 plus the slot boundaries, so it can skip JSON and
+    Decimal parsing. Empty if any slot lacks an intensity.
+    """
+    intensities = [slot.get('intensity') for slot in forecast]
+    if any(value is None for value in intensities):
+        return {}
+    return {
+        'forecast_blob': struct.pack(f'<{len(intensities)}d', *map(float, intensities)),
+        'forecast_from': [slot.get('from', '') for slot in forecast],
+        'forecast_to': [slot.get('to', '') for slot in forecast]
+    }
+
+
 def get_all_regions_summary() -> List[Dict]:
     """Get carbon intensity for all configured regions, sorted by intensity."""
     results = []
@@ -6,9 +6,13 @@ and collects final execution data with accurate metrics.
 """
 
 import json
-import boto3
 import os
+import sys
+import time
+import urllib3
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timezone
+from decimal import Decimal
 from pipeline_data_collector import (
     collect_pipeline_data, 
     calculate_accurate_sci,
@@ -16,9 +20,95 @@ from pipeline_data_collector import (
 )
 import logging
 
+# orjson is optional (add it via a Lambda layer); the stdlib encoder is the fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Configuration (environment is fixed for the lifetime of the container)
+ELECTRICITY_MAPS_TOKEN = os.environ.get('ELECTRICITY_MAPS_TOKEN', '7Cq9hfFAKl0gAtYNhvc2')
+SNS_TOPIC_ARN = os.environ.get('SNS_TOPIC_ARN')
+
+# Carbon intensity API endpoints and shared request headers
+_UK_INTENSITY_URL = 'https://api.carbonintensity.org.uk/intensity'
+_UK_HEADERS = {'Accept': 'application/json'}
+_EM_URL_TMPL = 'https://api.electricitymaps.com/v3/carbon-intensity/latest?dataCenterRegion={}&dataCenterProvider=aws'
+_EM_HEADERS = {'auth-token': ELECTRICITY_MAPS_TOKEN}
+
+# Storage module lives in lambda/api; resolve it once at import time rather
+# than on every store_execution_data call, without duplicating sys.path entries
+_LAMBDA_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _LAMBDA_ROOT not in sys.path:
+    sys.path.append(_LAMBDA_ROOT)
+try:
+    from api.pipeline_storage import store_pipeline_execution_data
+    PIPELINE_STORAGE_AVAILABLE = True
+except ImportError as e:
+    logger.warning(f"Pipeline storage module not available: {e}")
+    PIPELINE_STORAGE_AVAILABLE = False
+
+# Kept at module scope so worker threads survive warm invocations
+_EXECUTOR = ThreadPoolExecutor(max_workers=2)
+
+# Pooled HTTP connections keep the TLS session to the carbon APIs alive across
+# warm invocations (urllib3 ships with botocore, so no extra dependency).
+# One retry, for connection failures only: a read timeout means the API is
+# slow, and retrying it would only stretch the wait before the fallback. Worst
+# case is 2s + 0.3s + 2s + 5s, under the 10s the old urlopen call could block.
+_HTTP = urllib3.PoolManager(
+    num_pools=2,
+    maxsize=2,
+    timeout=urllib3.Timeout(connect=2.0, read=5.0),
+    retries=urllib3.Retry(total=1, read=0, backoff_factor=0.3)
+)
+
+# Execution records are kept for one year
+_TTL_SECONDS = 365 * 24 * 3600
+
+# Circuit breakers for the carbon intensity APIs, one per upstream so an
+# outage of one never makes the other fall back. Transport errors, timeouts
+# and 5xx replies open the breaker: that API is skipped and the fallback used
+# until open_until (backoff doubles up to 10 min). 4xx replies (bad token,
+# unknown region) are deterministic, so only that call falls back.
+_CI_BREAKERS = {
+    'uk-grid-eso': {'count': 0, 'open_until': 0.0},
+    'electricitymaps': {'count': 0, 'open_until': 0.0},
+}
+
+# SNS client, created on first notification and reused while the container is warm
+_SNS = None
+
+# Notifications are published in the background while the response is built,
+# then waited on (bounded) before returning: Lambda freezes the container once
+# the handler returns, so a publish left in flight could be lost and would hold
+# an _EXECUTOR worker into the next invocation. 0 opts out (fire-and-forget).
+_NOTIFICATION_WAIT_SECONDS = float(os.environ.get('SNS_PUBLISH_WAIT_SECONDS', '2'))
+
+# Completion notification layout, filled with str.format_map per message
+_NOTIFICATION_SUBJECT = 'Pipeline {status}: {pipeline_name}'
+_NOTIFICATION_TEMPLATE = (
+    "Pipeline Execution Complete\n"
+    "\n"
+    "Pipeline: {pipeline_name}\n"
+    "Status: {status}\n"
+    "Duration: {minutes}m {seconds}s\n"
+    "Carbon Footprint: {sci_score:.2f}g CO₂\n"
+    "Carbon Intensity: {carbon_intensity} gCO₂/kWh\n"
+    "\n"
+    "Execution ID: {execution_id}"
+)
+
+def _dumps(value) -> str:
+    """Serialize to a JSON string, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value)
+
+
 def lambda_handler(event, context):
     """
     Handle pipeline completion events from EventBridge
@@ -29,7 +119,9 @@ def lambda_handler(event, context):
     3. Manual triggers for data collection
     """
     
-    logger.info(f"Pipeline completion handler triggered: {json.dumps(event)}")
+    # Only pay for serializing the (possibly large) event when INFO is emitted
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(f"Pipeline completion handler triggered: {_dumps(event)}")
     
     try:
         # Determine event source and extract pipeline details
@@ -39,19 +131,27 @@ def lambda_handler(event, context):
             logger.error("Could not extract pipeline information from event")
             return {'statusCode': 400, 'body': 'Invalid event format'}
         
-        # Collect comprehensive pipeline data
-        pipeline_data = collect_pipeline_data(
+        region = pipeline_info.get('region', 'eu-west-2')
+        
+        # Pipeline data (boto3) and carbon intensity (HTTP) are independent,
+        # so fetch them concurrently
+        pipeline_future = _EXECUTOR.submit(
+            collect_pipeline_data,
             pipeline_info['pipeline_name'],
             pipeline_info['execution_id'],
-            pipeline_info.get('region', 'eu-west-2')
+            region
         )
+        intensity_future = _EXECUTOR.submit(get_current_carbon_intensity, region)
+        
+        # Collect comprehensive pipeline data
+        pipeline_data = pipeline_future.result()
         
         if pipeline_data.get('error'):
             logger.error(f"Error collecting pipeline data: {pipeline_data['error']}")
             return {'statusCode': 500, 'body': f"Data collection failed: {pipeline_data['error']}"}
         
         # Get current carbon intensity for accurate SCI calculation
-        carbon_intensity = get_current_carbon_intensity(pipeline_info.get('region', 'eu-west-2'))
+        carbon_intensity = intensity_future.result()
         
         # Calculate accurate SCI using real AWS data
         sci_calculation = calculate_accurate_sci(pipeline_data, carbon_intensity)
@@ -65,20 +165,33 @@ def lambda_handler(event, context):
         if success:
             logger.info(f"Successfully processed pipeline completion: {pipeline_info['execution_id']}")
             
-            # Send notification if configured
-            send_completion_notification(execution_record)
+            # Send notification if configured (published off the critical path);
+            # minimal records for pipelines with no stages have nothing to report
+            notification = None
+            if 'carbon_analysis' in execution_record:
+                notification = send_completion_notification(execution_record)
             
-            return {
-                'statusCode': 200,
-                'body': json.dumps({
-                    'message': 'Pipeline data collected successfully',
-                    'execution_id': pipeline_info['execution_id'],
-                    'sci_score': sci_calculation['sci'],
-                    'carbon_intensity': carbon_intensity,
-                    'duration_seconds': pipeline_data.get('duration_seconds'),
-                    'status': pipeline_data.get('status')
-                })
-            }
+            # EventBridge discards the response body, so only build it for
+            # callers that read it (API Gateway / direct invocation)
+            if pipeline_info['event_source'] in _EVENTBRIDGE_EVENT_SOURCES:
+                response = {'statusCode': 200}
+            else:
+                response = {
+                    'statusCode': 200,
+                    'body': _dumps({
+                        'message': 'Pipeline data collected successfully',
+                        'execution_id': pipeline_info['execution_id'],
+                        'sci_score': sci_calculation['sci'],
+                        'carbon_intensity': carbon_intensity,
+                        'duration_seconds': pipeline_data.get('duration_seconds'),
+                        'status': pipeline_data.get('status')
+                    })
+                }
+            
+            if notification is not None and _NOTIFICATION_WAIT_SECONDS > 0:
+                wait([notification], timeout=_NOTIFICATION_WAIT_SECONDS)
+            
+            return response
         else:
             logger.error("Failed to store execution data")
             return {'statusCode': 500, 'body': 'Failed to store execution data'}
@@ -87,40 +200,74 @@ def lambda_handler(event, context):
         logger.error(f"Error in pipeline completion handler: {e}")
         return {
             'statusCode': 500,
-            'body': json.dumps({
+            'body': _dumps({
                 'error': 'Internal server error',
                 'message': str(e)
             })
         }
 
 
+def _is_pipeline_check(event: dict) -> bool:
+    """Check the fields a scheduled pipeline_check event can carry its marker in"""
+    if event.get('detail-type') == 'pipeline_check':
+        return True
+    
+    detail = event.get('detail')
+    if isinstance(detail, dict) and detail.get('type') == 'pipeline_check':
+        return True
+    
+    # Scheduled rules named after the check (e.g. .../rule/pipeline_check-...)
+    return any('pipeline_check' in resource for resource in event.get('resources', ()))
+
+
+def _from_codepipeline(event: dict) -> dict:
+    """EventBridge CodePipeline state change"""
+    detail = event.get('detail', {})
+    return {
+        'pipeline_name': detail.get('pipeline'),
+        'execution_id': detail.get('execution-id'),
+        'state': detail.get('state'),
+        'region': event.get('region', 'eu-west-2'),
+        'event_source': 'codepipeline_state_change'
+    }
+
+
+def _from_scheduled(event: dict) -> dict:
+    """Custom scheduled check event; None for other scheduled events"""
+    if not _is_pipeline_check(event):
+        return None
+    
+    detail = event.get('detail', {})
+    return {
+        'pipeline_name': detail.get('pipeline_name'),
+        'execution_id': detail.get('execution_id'),
+        'region': detail.get('region', 'eu-west-2'),
+        'event_source': 'scheduled_check'
+    }
+
+
+# EventBridge event parsers keyed by event 'source'
+_EVENT_SOURCE_HANDLERS = {
+    'aws.codepipeline': _from_codepipeline,
+    'aws.events': _from_scheduled,
+}
+
+# event_source values whose invoker (EventBridge) ignores the response body
+_EVENTBRIDGE_EVENT_SOURCES = frozenset(('codepipeline_state_change', 'scheduled_check'))
+
+
 def extract_pipeline_info(event: dict) -> dict:
     """Extract pipeline information from various event sources"""
     
-    # EventBridge CodePipeline state change
-    if event.get('source') == 'aws.codepipeline':
-        detail = event.get('detail', {})
-        return {
-            'pipeline_name': detail.get('pipeline'),
-            'execution_id': detail.get('execution-id'),
-            'state': detail.get('state'),
-            'region': event.get('region', 'eu-west-2'),
-            'event_source': 'codepipeline_state_change'
-        }
-    
-    # Scheduled check event
-    elif event.get('source') == 'aws.events' and 'pipeline_check' in str(event):
-        # Custom scheduled event format
-        detail = event.get('detail', {})
-        return {
-            'pipeline_name': detail.get('pipeline_name'),
-            'execution_id': detail.get('execution_id'),
-            'region': detail.get('region', 'eu-west-2'),
-            'event_source': 'scheduled_check'
-        }
+    # EventBridge events (CodePipeline state change, scheduled check)
+    handler = _EVENT_SOURCE_HANDLERS.get(event.get('source'))
+    if handler:
+        pipeline_info = handler(event)
+        if pipeline_info:
+            return pipeline_info
     
     # Manual trigger (API Gateway or direct invocation)
-    elif 'pipeline_name' in event and 'execution_id' in event:
+    if 'pipeline_name' in event and 'execution_id' in event:
         return {
             'pipeline_name': event['pipeline_name'],
             'execution_id': event['execution_id'],
@@ -129,87 +276,134 @@ def extract_pipeline_info(event: dict) -> dict:
         }
     
     # Lambda test event
-    elif event.get('Records'):
+    if event.get('Records'):
         # Handle SQS or SNS triggers if needed
         return None
     
-    logger.warning(f"Unknown event format: {event}")
+    logger.warning("Unknown event format: %s", event)
     return None
 
 
+def _open_breaker(breaker: dict) -> None:
+    """Record an upstream outage and skip that API for a backoff period"""
+    breaker['count'] += 1
+    breaker['open_until'] = time.time() + min(60 * 2 ** (breaker['count'] - 1), 600)
+
+
 def get_current_carbon_intensity(region: str) -> float:
     """Get current carbon intensity for the region"""
     
+    if region == 'eu-west-2':
+        # UK Grid ESO API
+        source, url, headers = 'uk-grid-eso', _UK_INTENSITY_URL, _UK_HEADERS
+    else:
+        # ElectricityMaps API for other regions
+        source, url, headers = 'electricitymaps', _EM_URL_TMPL.format(region), _EM_HEADERS
+    
+    breaker = _CI_BREAKERS[source]
+    if time.time() < breaker['open_until']:
+        logger.warning(f"{source} circuit open, using fallback value")
+        return 300  # Fallback value
+    
+    try:
+        response = _HTTP.request('GET', url, headers=headers)
+    except urllib3.exceptions.HTTPError as e:
+        # Connection failures and timeouts (after urllib3's own retry)
+        logger.error(f"Error fetching carbon intensity from {source}: {e}")
+        _open_breaker(breaker)
+        return 300  # Fallback value
+    
+    if response.status != 200:
+        logger.error(f"{source} API returned HTTP {response.status} for {region}")
+        if response.status >= 500:
+            _open_breaker(breaker)
+        return 300  # Fallback value
+    
     try:
-        # Import carbon intensity fetching logic
-        # This should use the same logic as the main carbon ingestion
+        data = json.loads(response.data)
         
-        if region == 'eu-west-2':
-            # UK Grid ESO API
-            import urllib.request
-            import json
-            
-            req = urllib.request.Request(
-                'https://api.carbonintensity.org.uk/intensity',
-                headers={'Accept': 'application/json'}
-            )
+        if source == 'uk-grid-eso':
+            grid_intensity = data['data'][0]['intensity']['actual'] or data['data'][0]['intensity']['forecast']
             
-            with urllib.request.urlopen(req, timeout=10) as response:
-                data = json.loads(response.read().decode())
-                grid_intensity = data['data'][0]['intensity']['actual'] or data['data'][0]['intensity']['forecast']
-                
-                # Apply AWS datacenter formula
-                aws_renewable_pct = 0.80  # 80% renewable for AWS eu-west-2
-                pue = 1.15  # AWS 2024 Sustainability Report
-                datacenter_intensity = grid_intensity * (1 - aws_renewable_pct) * pue
-                
-                return round(datacenter_intensity, 1)
-        
+            # Apply AWS datacenter formula
+            aws_renewable_pct = 0.80  # 80% renewable for AWS eu-west-2
+            pue = 1.15  # AWS 2024 Sustainability Report
+            intensity = round(grid_intensity * (1 - aws_renewable_pct) * pue, 1)
         else:
-            # ElectricityMaps API for other regions
-            token = os.environ.get('ELECTRICITY_MAPS_TOKEN', '7Cq9hfFAKl0gAtYNhvc2')
-            
-            import urllib.request
-            import json
-            
-            url = f'https://api.electricitymaps.com/v3/carbon-intensity/latest?dataCenterRegion={region}&dataCenterProvider=aws'
-            req = urllib.request.Request(url, headers={'auth-token': token})
-            
-            with urllib.request.urlopen(req, timeout=10) as response:
-                data = json.loads(response.read().decode())
-                return round(data.get('carbonIntensity', 300), 1)
-    
+            intensity = round(data.get('carbonIntensity', 300), 1)
     except Exception as e:
-        logger.error(f"Error fetching carbon intensity: {e}")
+        logger.error(f"Unexpected carbon intensity response from {source}: {e}")
         return 300  # Fallback value
+    
+    breaker['count'] = 0
+    return intensity
+
+
+def _encode_json(value) -> str:
+    """Compact JSON encoding for attributes stored as a single string"""
+    return json.dumps(value, separators=(',', ':'), default=str)
+
+
+def _to_decimal(value):
+    """Convert floats to Decimal (via str, avoiding binary float artifacts) for DynamoDB"""
+    if isinstance(value, float):
+        return Decimal(str(value))
+    return value
 
 
 def create_execution_record(pipeline_data: dict, sci_calculation: dict, pipeline_info: dict) -> dict:
     """Create comprehensive execution record for storage"""
     
-    # Extract build summaries
+    now = datetime.now(timezone.utc)
+    now_ts = now.timestamp()
+    
+    # Look up each field once
+    stages = pipeline_data.get('stages', ())
+    start_time = pipeline_data.get('start_time')
+    end_time = pipeline_data.get('end_time')
+    
+    # Nothing has run yet (e.g. a scheduled check on a queued pipeline), so
+    # there is no carbon analysis to record
+    if not stages:
+        return {
+            'execution_id': pipeline_data['execution_id'],
+            'timestamp': int(now_ts),
+            'pipeline_name': pipeline_data['pipeline_name'],
+            'status': pipeline_data.get('status', 'UNKNOWN'),
+            'event_source': pipeline_info.get('event_source', 'unknown'),
+            'created_at': now.isoformat(),
+            'data_version': '2.1',
+            'ttl': int(now_ts + _TTL_SECONDS)
+        }
+    
+    # Extract build summaries and structure counts in a single pass
     build_summaries = []
     total_build_duration = 0
+    total_stages = 0
+    total_actions = 0
     
-    for stage in pipeline_data.get('stages', []):
-        for action in stage.get('actions', []):
-            if action.get('build_details'):
-                build_details = action['build_details']
+    for stage in stages:
+        total_stages += 1
+        for action in stage.get('actions', ()):
+            total_actions += 1
+            build_details = action.get('build_details')
+            if build_details:
+                build_duration = build_details.get('duration_seconds', 0)
                 build_summaries.append({
                     'build_id': build_details.get('build_id'),
                     'project_name': build_details.get('project_name'),
                     'compute_type': build_details.get('compute_type'),
-                    'duration_seconds': build_details.get('duration_seconds', 0),
+                    'duration_seconds': build_duration,
                     'vcpu_count': build_details.get('vcpu_count', 0),
                     'memory_mb': build_details.get('memory_mb', 0),
                     'status': build_details.get('status')
                 })
-                total_build_duration += build_details.get('duration_seconds', 0)
+                total_build_duration += build_duration
     
     # Create comprehensive record
     record = {
         'execution_id': pipeline_data['execution_id'],
-        'timestamp': int(datetime.now(timezone.utc).timestamp()),
+        'timestamp': int(now_ts),
         'pipeline_name': pipeline_data['pipeline_name'],
         'pipeline_region': pipeline_info.get('region', 'eu-west-2'),
         'trigger_source': 'aws_pipeline_completion',
@@ -217,50 +411,54 @@ def create_execution_record(pipeline_data: dict, sci_calculation: dict, pipeline
         
         # Timing information
         'timing': {
-            'start_time': pipeline_data.get('start_time').isoformat() if pipeline_data.get('start_time') else None,
-            'end_time': pipeline_data.get('end_time').isoformat() if pipeline_data.get('end_time') else None,
+            'start_time': start_time.isoformat() if start_time else None,
+            'end_time': end_time.isoformat() if end_time else None,
             'duration_seconds': pipeline_data.get('duration_seconds', 0),
             'total_build_duration_seconds': total_build_duration
         },
         
-        # Carbon analysis (using real data)
+        # Carbon analysis (using real data); numbers are stored as Decimal
+        # up front so the storage layer has no floats left to convert
         'carbon_analysis': {
             'calculation_method': sci_calculation.get('calculation_method', 'real_aws_data'),
-            'carbon_intensity': sci_calculation['carbon_intensity'],
-            'energy_kwh': sci_calculation['energy_kwh'],
-            'operational_g': sci_calculation['operational_g'],
-            'embodied_g': sci_calculation['embodied_g'],
-            'total_g': sci_calculation['total_g'],
-            'sci_score': sci_calculation['sci']
+            'carbon_intensity': _to_decimal(sci_calculation['carbon_intensity']),
+            'energy_kwh': _to_decimal(sci_calculation['energy_kwh']),
+            'operational_g': _to_decimal(sci_calculation['operational_g']),
+            'embodied_g': _to_decimal(sci_calculation['embodied_g']),
+            'total_g': _to_decimal(sci_calculation['total_g']),
+            'sci_score': _to_decimal(sci_calculation['sci'])
         },
         
         # Resource usage (actual AWS data)
         'resource_usage': {
-            'total_vcpu_hours': sci_calculation.get('vcpu_hours', 0),
-            'build_summaries': build_summaries,
+            'total_vcpu_hours': _to_decimal(sci_calculation.get('vcpu_hours', 0)),
             'total_builds': len(build_summaries)
         },
         
+        # Nested detail is stored as pre-encoded JSON strings so the DynamoDB
+        # serializer writes one String attribute instead of walking every node
+        'build_summaries_json': _encode_json(build_summaries),
+        
         # Pipeline structure
-        'pipeline_structure': {
-            'total_stages': len(pipeline_data.get('stages', [])),
-            'total_actions': sum(len(stage.get('actions', [])) for stage in pipeline_data.get('stages', [])),
+        'pipeline_structure_json': _encode_json({
+            'total_stages': total_stages,
+            'total_actions': total_actions,
             'build_projects': pipeline_data.get('build_projects', [])
-        },
+        }),
         
         # Commit information
-        'commit_details': pipeline_data.get('commit_details', {}),
+        'commit_details_json': _encode_json(pipeline_data.get('commit_details', {})),
         
         # Trigger information
-        'trigger_details': pipeline_data.get('trigger', {}),
+        'trigger_details_json': _encode_json(pipeline_data.get('trigger', {})),
         
         # Event source
         'event_source': pipeline_info.get('event_source', 'unknown'),
         
         # Metadata
-        'created_at': datetime.now(timezone.utc).isoformat(),
-        'data_version': '2.0',  # Version of data collection
-        'ttl': int((datetime.now(timezone.utc).timestamp()) + (365 * 24 * 3600))  # 1 year TTL
+        'created_at': now.isoformat(),
+        'data_version': '2.1',  # Version of data collection
+        'ttl': int(now_ts + _TTL_SECONDS)  # 1 year TTL
     }
     
     return record
@@ -269,14 +467,11 @@ def create_execution_record(pipeline_data: dict, sci_calculation: dict, pipeline
 def store_execution_data(execution_record: dict) -> bool:
     """Store execution data in DynamoDB"""
     
+    if not PIPELINE_STORAGE_AVAILABLE:
+        logger.error("Error storing execution data: pipeline storage module not available")
+        return False
+    
     try:
-        # Import storage module
-        import sys
-        import os
-        sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-        
-        from api.pipeline_storage import store_pipeline_execution_data
-        
         return store_pipeline_execution_data(execution_record)
         
     except Exception as e:
@@ -284,45 +479,58 @@ def store_execution_data(execution_record: dict) -> bool:
         return False
 
 
+def _log_notification_result(future):
+    """Log the outcome of a background SNS publish"""
+    error = future.exception()
+    if error:
+        logger.error(f"Error sending notification: {error}")
+    else:
+        logger.info("Completion notification sent")
+
+
 def send_completion_notification(execution_record: dict):
-    """Send completion notification if configured"""
+    """
+    Send completion notification if configured
+    
+    The publish runs on the shared executor; returns its future, or None
+    when no notification was sent.
+    """
+    
+    if not SNS_TOPIC_ARN:
+        return None
     
     try:
-        sns_topic_arn = os.environ.get('SNS_TOPIC_ARN')
-        if not sns_topic_arn:
-            return
-        
-        sns = boto3.client('sns')
+        global _SNS
+        if _SNS is None:
+            # Imported here so deployments without SNS_TOPIC_ARN never need it
+            import boto3
+            _SNS = boto3.client('sns')
         
         # Create notification message
-        status = execution_record['status']
-        pipeline_name = execution_record['pipeline_name']
-        duration = execution_record['timing']['duration_seconds']
-        sci_score = execution_record['carbon_analysis']['sci_score']
-        carbon_intensity = execution_record['carbon_analysis']['carbon_intensity']
-        
-        message = f"""
-Pipeline Execution Complete
-
-Pipeline: {pipeline_name}
-Status: {status}
-Duration: {duration // 60}m {duration % 60}s
-Carbon Footprint: {sci_score:.2f}g CO₂
-Carbon Intensity: {carbon_intensity} gCO₂/kWh
-
-Execution ID: {execution_record['execution_id']}
-        """.strip()
+        carbon_analysis = execution_record['carbon_analysis']
+        minutes, seconds = divmod(execution_record['timing']['duration_seconds'], 60)
+        fields = {
+            'pipeline_name': execution_record['pipeline_name'],
+            'status': execution_record['status'],
+            'minutes': minutes,
+            'seconds': seconds,
+            'sci_score': carbon_analysis['sci_score'],
+            'carbon_intensity': carbon_analysis['carbon_intensity'],
+            'execution_id': execution_record['execution_id']
+        }
         
-        sns.publish(
-            TopicArn=sns_topic_arn,
-            Subject=f'Pipeline {status}: {pipeline_name}',
-            Message=message
+        future = _EXECUTOR.submit(
+            _SNS.publish,
+            TopicArn=SNS_TOPIC_ARN,
+            Subject=_NOTIFICATION_SUBJECT.format_map(fields),
+            Message=_NOTIFICATION_TEMPLATE.format_map(fields)
         )
-        
-        logger.info("Completion notification sent")
+        future.add_done_callback(_log_notification_result)
+        return future
         
     except Exception as e:
         logger.error(f"Error sending notification: {e}")
+        return None
 
 
 # Utility function for manual data collection
@@ -11,16 +11,91 @@ This provides accurate data for SCI calculations and carbon intelligence.
 """
 
 import boto3
+from botocore.config import Config
 import json
 import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional, Tuple
 import logging
+import random
+import re
+import statistics
 import time
 
+# NumPy is optional; SCI aggregation falls back to a scalar loop without it
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Shared client config: keep-alive connections, a pool large enough for the
+# build fetch pool and adaptive retries that back off on throttling
+_BOTO_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=50,
+    retries={'total_max_attempts': 10, 'mode': 'adaptive'},
+    connect_timeout=3,
+    read_timeout=30
+)
+
+# CodeBuild/CloudWatch/CodeCommit lookups are I/O bound and boto3 clients are
+# thread-safe, so independent fetches overlap on a shared pool that survives
+# warm invocations
+_BUILD_FETCH_EXECUTOR = ThreadPoolExecutor(max_workers=8)
+
+# CodeBuild compute type specifications
+# https://docs.aws.amazon.com/codebuild/latest/userguide/build-env-ref-compute-types.html
+COMPUTE_SPECS = {
+    'BUILD_GENERAL1_SMALL': {'vcpu': 2, 'memory_mb': 3072, 'storage_gb': 64},
+    'BUILD_GENERAL1_MEDIUM': {'vcpu': 4, 'memory_mb': 7168, 'storage_gb': 128},
+    'BUILD_GENERAL1_LARGE': {'vcpu': 8, 'memory_mb': 15360, 'storage_gb': 128},
+    'BUILD_GENERAL1_2XLARGE': {'vcpu': 72, 'memory_mb': 145408, 'storage_gb': 824},
+    # ARM instances
+    'BUILD_GENERAL1_SMALL_ARM': {'vcpu': 2, 'memory_mb': 3072, 'storage_gb': 64},
+    'BUILD_GENERAL1_MEDIUM_ARM': {'vcpu': 4, 'memory_mb': 7168, 'storage_gb': 128},
+    'BUILD_GENERAL1_LARGE_ARM': {'vcpu': 8, 'memory_mb': 15360, 'storage_gb': 128},
+}
+
+# SCI constants
+PUE = 1.15  # AWS PUE (2024 Sustainability Report)
+EMBODIED_G_PER_VCPU_HOUR = 2.5  # Embodied carbon per vCPU-hour
+
+# Below this many builds the scalar SCI loop is cheaper than NumPy array setup
+NUMPY_MIN_BUILDS = 8
+
+# Repository name in a CodeCommit revision URL: the segment after
+# /repository/ or /repositories/ in console links, else the last path segment
+_CC_URL_RE = re.compile(r'codecommit(?:.*/repositor(?:y|ies)/([^/?#]+)|[^?#]*/([^/?#]+))')
+
+# Cap for the exponential backoff between pipeline status polls
+MAX_POLL_INTERVAL_SECONDS = 120
+
+# Maximum build IDs / project names accepted by a single CodeBuild batch call
+BATCH_GET_BUILDS_LIMIT = 100
+BATCH_GET_PROJECTS_LIMIT = 100
+
+# Build project configuration cached across warm invocations, keyed by
+# (region, project name) and stored with the time it was fetched
+_PROJECTS_CACHE: Dict[Tuple[str, str], Tuple[float, Dict]] = {}
+_PROJECTS_TTL = 900
+
+# CloudWatch get_metric_data accepts up to 500 queries per call; each build
+# needs one query per (metric, statistic) pair
+METRIC_DATA_QUERY_LIMIT = 500
+BUILD_METRICS = (('cpu', 'CPUUtilization'), ('memory', 'MemoryUtilization'))
+BUILD_METRIC_STATS = ('Average', 'Maximum')
+
+# Metric window per build: capped at 2 hours after start, and skipped entirely
+# when shorter than a minute since CloudWatch will have nothing to return
+MAX_BUILD_METRICS_WINDOW = timedelta(hours=2)
+MIN_BUILD_METRICS_WINDOW_SECONDS = 60
+
 class AWSPipelineDataCollector:
     """Collects comprehensive pipeline data from AWS services"""
     
@@ -28,14 +103,11 @@ class AWSPipelineDataCollector:
         self.region = region
         
         # Initialize AWS clients
-        self.codepipeline = boto3.client('codepipeline', region_name=region)
-        self.codebuild = boto3.client('codebuild', region_name=region)
-        self.codecommit = boto3.client('codecommit', region_name=region)
-        self.cloudwatch = boto3.client('cloudwatch', region_name=region)
-        self.logs = boto3.client('logs', region_name=region)
-        
-        # Cache for build project details
-        self._build_projects_cache = {}
+        self.codepipeline = boto3.client('codepipeline', region_name=region, config=_BOTO_CONFIG)
+        self.codebuild = boto3.client('codebuild', region_name=region, config=_BOTO_CONFIG)
+        self.codecommit = boto3.client('codecommit', region_name=region, config=_BOTO_CONFIG)
+        self.cloudwatch = boto3.client('cloudwatch', region_name=region, config=_BOTO_CONFIG)
+        self.logs = boto3.client('logs', region_name=region, config=_BOTO_CONFIG)
     
     def get_pipeline_execution_details(self, pipeline_name: str, execution_id: str) -> Dict:
         """
@@ -59,15 +131,16 @@ class AWSPipelineDataCollector:
             
             execution = execution_response['pipelineExecution']
             
+            # Fetch commit details in the background while stages and builds are collected
+            artifact_revisions = execution.get('artifactRevisions', [])
+            commit_future = (
+                _BUILD_FETCH_EXECUTOR.submit(self.get_commit_details, artifact_revisions[0])
+                if artifact_revisions else None
+            )
+            
             # Get pipeline state for stage details
             state_response = self.codepipeline.get_pipeline_state(name=pipeline_name)
             
-            # Get action executions for detailed timing
-            actions_response = self.codepipeline.list_action_executions(
-                pipelineName=pipeline_name,
-                filter={'pipelineExecutionId': execution_id}
-            )
-            
             # Process execution data
             pipeline_data = {
                 'pipeline_name': pipeline_name,
@@ -77,7 +150,7 @@ class AWSPipelineDataCollector:
                 'end_time': execution.get('endTime'),
                 'duration_seconds': None,
                 'trigger': execution.get('trigger', {}),
-                'artifact_revisions': execution.get('artifactRevisions', []),
+                'artifact_revisions': artifact_revisions,
                 'stages': [],
                 'total_build_time_seconds': 0,
                 'total_cpu_credits': 0,
@@ -90,62 +163,97 @@ class AWSPipelineDataCollector:
                 duration = pipeline_data['end_time'] - pipeline_data['start_time']
                 pipeline_data['duration_seconds'] = int(duration.total_seconds())
             
-            # Process stages and actions
+            # Stream action executions page by page for detailed timing, grouping
+            # them by stage and building each action's data as it arrives
+            actions_by_stage = defaultdict(list)
+            has_build_actions = False
+            
+            paginator = self.codepipeline.get_paginator('list_action_executions')
+            pages = paginator.paginate(
+                pipelineName=pipeline_name,
+                filter={'pipelineExecutionId': execution_id},
+                PaginationConfig={'PageSize': 100}
+            )
+            
+            for action in (action for page in pages for action in page['actionExecutions']):
+                action_get = action.get
+                provider = action['actionTypeId']['provider']
+                if provider == 'CodeBuild':
+                    has_build_actions = True
+                
+                # Calculate action duration
+                start_time = action_get('startTime')
+                end_time = action_get('lastUpdateTime')
+                duration_seconds = (
+                    int((end_time - start_time).total_seconds())
+                    if start_time and end_time else None
+                )
+                
+                actions_by_stage[action['stageName']].append({
+                    'action_name': action['actionName'],
+                    'action_type': provider,
+                    'status': action_get('status'),
+                    'start_time': start_time,
+                    'end_time': end_time,
+                    'duration_seconds': duration_seconds,
+                    'external_execution_id': action_get('externalExecutionId'),
+                    'build_details': None
+                })
+            
+            # Process stages; CodeBuild lookups are collected and fetched in
+            # bulk once the structure is built
+            build_actions = []
+            append_stage = pipeline_data['stages'].append
+            
             for stage in state_response['stageStates']:
-                stage_data = {
-                    'stage_name': stage['stageName'],
+                stage_name = stage['stageName']
+                stage_actions = actions_by_stage.get(stage_name, [])
+                
+                append_stage({
+                    'stage_name': stage_name,
                     'status': stage.get('latestExecution', {}).get('status'),
-                    'actions': []
-                }
+                    'actions': stage_actions
+                })
                 
-                # Find actions for this stage
-                stage_actions = [
-                    action for action in actions_response['actionExecutions']
-                    if action['stageName'] == stage['stageName']
-                ]
+                # Queue CodeBuild details lookup for build actions
+                if has_build_actions:
+                    build_actions.extend(
+                        action_data for action_data in stage_actions
+                        if action_data['action_type'] == 'CodeBuild' and action_data['external_execution_id']
+                    )
+            
+            # Fetch and process all builds in bulk; pipelines without build
+            # actions skip CodeBuild, project and CloudWatch lookups entirely
+            all_build_details = self._get_build_details_bulk(
+                [action_data['external_execution_id'] for action_data in build_actions]
+            ) if build_actions else []
+            
+            # Track seen projects in a set; build_projects stays an ordered list
+            seen_projects = set()
+            append_project = pipeline_data['build_projects'].append
+            total_build_time_seconds = total_cpu_credits = total_memory_mb_seconds = 0
+            
+            for action_data, build_details in zip(build_actions, all_build_details):
+                action_data['build_details'] = build_details
                 
-                for action in stage_actions:
-                    action_data = {
-                        'action_name': action['actionName'],
-                        'action_type': action['actionTypeId']['provider'],
-                        'status': action.get('status'),
-                        'start_time': action.get('startTime'),
-                        'end_time': action.get('lastUpdateTime'),
-                        'duration_seconds': None,
-                        'external_execution_id': action.get('externalExecutionId'),
-                        'build_details': None
-                    }
-                    
-                    # Calculate action duration
-                    if action_data['start_time'] and action_data['end_time']:
-                        duration = action_data['end_time'] - action_data['start_time']
-                        action_data['duration_seconds'] = int(duration.total_seconds())
-                    
-                    # Get CodeBuild details if this is a build action
-                    if (action['actionTypeId']['provider'] == 'CodeBuild' and 
-                        action_data['external_execution_id']):
-                        
-                        build_details = self.get_codebuild_execution_details(
-                            action_data['external_execution_id']
-                        )
-                        action_data['build_details'] = build_details
-                        
-                        if build_details:
-                            pipeline_data['total_build_time_seconds'] += build_details.get('duration_seconds', 0)
-                            pipeline_data['total_cpu_credits'] += build_details.get('cpu_credits_used', 0)
-                            pipeline_data['total_memory_mb_seconds'] += build_details.get('memory_mb_seconds', 0)
-                            
-                            if build_details.get('project_name') not in pipeline_data['build_projects']:
-                                pipeline_data['build_projects'].append(build_details.get('project_name'))
+                if build_details:
+                    details_get = build_details.get
+                    total_build_time_seconds += details_get('duration_seconds', 0)
+                    total_cpu_credits += details_get('cpu_credits_used', 0)
+                    total_memory_mb_seconds += details_get('memory_mb_seconds', 0)
                     
-                    stage_data['actions'].append(action_data)
-                
-                pipeline_data['stages'].append(stage_data)
+                    project_name = details_get('project_name')
+                    if project_name not in seen_projects:
+                        seen_projects.add(project_name)
+                        append_project(project_name)
+            
+            pipeline_data['total_build_time_seconds'] = total_build_time_seconds
+            pipeline_data['total_cpu_credits'] = total_cpu_credits
+            pipeline_data['total_memory_mb_seconds'] = total_memory_mb_seconds
             
-            # Get commit details if available
-            if pipeline_data['artifact_revisions']:
-                commit_details = self.get_commit_details(pipeline_data['artifact_revisions'][0])
-                pipeline_data['commit_details'] = commit_details
+            # Collect commit details if available
+            if commit_future is not None:
+                pipeline_data['commit_details'] = commit_future.result()
             
             logger.info(f"Successfully collected pipeline data for {execution_id}")
             return pipeline_data
@@ -169,70 +277,119 @@ class AWSPipelineDataCollector:
         Returns:
             Dictionary with build metrics including CPU/Memory usage
         """
+        return self._get_build_details_bulk([build_id])[0]
+    
+    def _get_build_details_bulk(self, build_ids: List[str]) -> List[Optional[Dict]]:
+        """Fetch and process several builds, preserving the order of build_ids"""
+        
+        if not build_ids:
+            return []
+        
+        try:
+            builds = self._bulk_fetch_builds(build_ids)
+        except Exception as e:
+            logger.error(f"Error fetching CodeBuild details: {e}")
+            return [
+                {'build_id': build_id, 'error': str(e), 'status': 'UNKNOWN'}
+                for build_id in build_ids
+            ]
+        
+        missing = [build_id for build_id in build_ids if build_id not in builds]
+        for build_id in missing:
+            logger.warning(f"No build found for ID: {build_id}")
+        
+        if not builds:
+            return [None] * len(build_ids)
+        
+        # Fetch CloudWatch metrics in the background while the project cache
+        # is primed, so per-build processing never hits the API
+        metrics_future = _BUILD_FETCH_EXECUTOR.submit(
+            self._fetch_all_build_metrics,
+            [(build_id, build.get('startTime'), build.get('endTime')) for build_id, build in builds.items()]
+        )
+        self._prefetch_build_projects({build['projectName'] for build in builds.values()})
+        build_metrics = metrics_future.result()
+        
+        return [
+            self._process_build_details(builds[build_id], build_metrics.get(build_id))
+            if build_id in builds else None
+            for build_id in build_ids
+        ]
+    
+    def _bulk_fetch_builds(self, build_ids: List[str]) -> Dict[str, Dict]:
+        """Fetch builds in chunks of BATCH_GET_BUILDS_LIMIT, keyed by build ID"""
+        
+        unique_ids = list(dict.fromkeys(build_ids))
+        builds = {}
+        
+        for i in range(0, len(unique_ids), BATCH_GET_BUILDS_LIMIT):
+            chunk = unique_ids[i:i + BATCH_GET_BUILDS_LIMIT]
+            logger.info(f"Fetching {len(chunk)} CodeBuild build(s)")
+            response = self.codebuild.batch_get_builds(ids=chunk)
+            for build in response.get('builds', []):
+                builds[build['id']] = build
+        
+        return builds
+    
+    def _process_build_details(self, build: Dict, cloudwatch_metrics: Optional[Dict] = None) -> Dict:
+        """Turn a batch_get_builds entry into build metrics including CPU/Memory usage"""
+        
+        build_id = build['id']
+        
         try:
-            logger.info(f"Fetching CodeBuild details: {build_id}")
-            
-            # Get build details
-            builds_response = self.codebuild.batch_get_builds(ids=[build_id])
-            
-            if not builds_response['builds']:
-                logger.warning(f"No build found for ID: {build_id}")
-                return None
-            
-            build = builds_response['builds'][0]
-            
             # Get build project details for compute type
             project_name = build['projectName']
             project_details = self.get_build_project_details(project_name)
+            compute_type = project_details.get('compute_type', 'BUILD_GENERAL1_MEDIUM')
             
+            # Calculate duration
+            start_time = build.get('startTime')
+            end_time = build.get('endTime')
+            duration_seconds = (
+                int((end_time - start_time).total_seconds())
+                if start_time and end_time else None
+            )
+            
+            phases = []
             build_data = {
                 'build_id': build_id,
                 'project_name': project_name,
                 'status': build.get('buildStatus'),
-                'start_time': build.get('startTime'),
-                'end_time': build.get('endTime'),
-                'duration_seconds': None,
-                'compute_type': project_details.get('compute_type', 'BUILD_GENERAL1_MEDIUM'),
+                'start_time': start_time,
+                'end_time': end_time,
+                'duration_seconds': duration_seconds,
+                'compute_type': compute_type,
                 'environment_type': project_details.get('environment_type', 'LINUX_CONTAINER'),
                 'cpu_credits_used': 0,
                 'memory_mb_seconds': 0,
                 'network_mb': 0,
                 'storage_gb': 0,
-                'phases': []
+                'phases': phases
             }
             
-            # Calculate duration
-            if build_data['start_time'] and build_data['end_time']:
-                duration = build_data['end_time'] - build_data['start_time']
-                build_data['duration_seconds'] = int(duration.total_seconds())
-            
             # Get build phases for detailed timing
-            if 'phases' in build:
-                for phase in build['phases']:
-                    phase_data = {
-                        'phase_type': phase.get('phaseType'),
-                        'status': phase.get('phaseStatus'),
-                        'start_time': phase.get('startTime'),
-                        'end_time': phase.get('endTime'),
-                        'duration_seconds': None
-                    }
-                    
-                    if phase_data['start_time'] and phase_data['end_time']:
-                        duration = phase_data['end_time'] - phase_data['start_time']
-                        phase_data['duration_seconds'] = int(duration.total_seconds())
-                    
-                    build_data['phases'].append(phase_data)
+            append_phase = phases.append
+            for phase in build.get('phases', ()):
+                phase_get = phase.get
+                phase_start = phase_get('startTime')
+                phase_end = phase_get('endTime')
+                
+                append_phase({
+                    'phase_type': phase_get('phaseType'),
+                    'status': phase_get('phaseStatus'),
+                    'start_time': phase_start,
+                    'end_time': phase_end,
+                    'duration_seconds': (
+                        int((phase_end - phase_start).total_seconds())
+                        if phase_start and phase_end else None
+                    )
+                })
             
             # Calculate resource usage based on compute type and duration
-            if build_data['duration_seconds']:
-                resource_usage = self.calculate_build_resource_usage(
-                    build_data['compute_type'],
-                    build_data['duration_seconds']
-                )
-                build_data.update(resource_usage)
+            if duration_seconds:
+                build_data.update(self.calculate_build_resource_usage(compute_type, duration_seconds))
             
-            # Get CloudWatch metrics if available
-            cloudwatch_metrics = self.get_build_cloudwatch_metrics(build_id, build_data['start_time'])
+            # Attach prefetched CloudWatch metrics if available
             if cloudwatch_metrics:
                 build_data['cloudwatch_metrics'] = cloudwatch_metrics
             
@@ -250,53 +407,59 @@ class AWSPipelineDataCollector:
     def get_build_project_details(self, project_name: str) -> Dict:
         """Get CodeBuild project configuration details"""
         
-        if project_name in self._build_projects_cache:
-            return self._build_projects_cache[project_name]
+        details = self._cached_project_details(project_name)
+        
+        if details is None:
+            self._prefetch_build_projects([project_name])
+            details = self._cached_project_details(project_name)
+        
+        return details or {}
+    
+    def _cached_project_details(self, project_name: str) -> Optional[Dict]:
+        """Return cached project details, or None if missing or older than _PROJECTS_TTL"""
+        
+        entry = _PROJECTS_CACHE.get((self.region, project_name))
+        if entry and time.time() - entry[0] < _PROJECTS_TTL:
+            return entry[1]
+        return None
+    
+    def _prefetch_build_projects(self, project_names) -> None:
+        """Load uncached project configurations with batched batch_get_projects calls"""
+        
+        missing = [name for name in project_names if self._cached_project_details(name) is None]
         
         try:
-            response = self.codebuild.batch_get_projects(names=[project_name])
-            
-            if not response['projects']:
-                return {}
-            
-            project = response['projects'][0]
-            environment = project.get('environment', {})
-            
-            details = {
-                'compute_type': environment.get('computeType', 'BUILD_GENERAL1_MEDIUM'),
-                'environment_type': environment.get('type', 'LINUX_CONTAINER'),
-                'image': environment.get('image', 'aws/codebuild/standard:5.0'),
-                'privileged_mode': environment.get('privilegedMode', False)
-            }
-            
-            self._build_projects_cache[project_name] = details
-            return details
+            for i in range(0, len(missing), BATCH_GET_PROJECTS_LIMIT):
+                chunk = missing[i:i + BATCH_GET_PROJECTS_LIMIT]
+                response = self.codebuild.batch_get_projects(names=chunk)
+                fetched_at = time.time()
+                
+                for project in response.get('projects', []):
+                    environment = project.get('environment', {})
+                    
+                    _PROJECTS_CACHE[(self.region, project['name'])] = (fetched_at, {
+                        'compute_type': environment.get('computeType', 'BUILD_GENERAL1_MEDIUM'),
+                        'environment_type': environment.get('type', 'LINUX_CONTAINER'),
+                        'image': environment.get('image', 'aws/codebuild/standard:5.0'),
+                        'privileged_mode': environment.get('privilegedMode', False)
+                    })
+                
+                # Remember projects CodeBuild did not return so lookups fall back to defaults
+                for name in chunk:
+                    if self._cached_project_details(name) is None:
+                        _PROJECTS_CACHE[(self.region, name)] = (fetched_at, {})
             
         except Exception as e:
             logger.error(f"Error fetching project details: {e}")
-            return {}
     
     def calculate_build_resource_usage(self, compute_type: str, duration_seconds: int) -> Dict:
         """
         Calculate resource usage based on CodeBuild compute type
         
-        AWS CodeBuild compute types and their specifications:
-        https://docs.aws.amazon.com/codebuild/latest/userguide/build-env-ref-compute-types.html
+        AWS CodeBuild compute types and their specifications: see COMPUTE_SPECS
         """
         
-        # CodeBuild compute type specifications
-        compute_specs = {
-            'BUILD_GENERAL1_SMALL': {'vcpu': 2, 'memory_mb': 3072, 'storage_gb': 64},
-            'BUILD_GENERAL1_MEDIUM': {'vcpu': 4, 'memory_mb': 7168, 'storage_gb': 128},
-            'BUILD_GENERAL1_LARGE': {'vcpu': 8, 'memory_mb': 15360, 'storage_gb': 128},
-            'BUILD_GENERAL1_2XLARGE': {'vcpu': 72, 'memory_mb': 145408, 'storage_gb': 824},
-            # ARM instances
-            'BUILD_GENERAL1_SMALL_ARM': {'vcpu': 2, 'memory_mb': 3072, 'storage_gb': 64},
-            'BUILD_GENERAL1_MEDIUM_ARM': {'vcpu': 4, 'memory_mb': 7168, 'storage_gb': 128},
-            'BUILD_GENERAL1_LARGE_ARM': {'vcpu': 8, 'memory_mb': 15360, 'storage_gb': 128},
-        }
-        
-        specs = compute_specs.get(compute_type, compute_specs['BUILD_GENERAL1_MEDIUM'])
+        specs = COMPUTE_SPECS.get(compute_type, COMPUTE_SPECS['BUILD_GENERAL1_MEDIUM'])
         
         # Calculate usage
         vcpu_seconds = specs['vcpu'] * duration_seconds
@@ -316,58 +479,105 @@ class AWSPipelineDataCollector:
             'duration_hours': duration_seconds / 3600
         }
     
-    def get_build_cloudwatch_metrics(self, build_id: str, start_time: datetime) -> Optional[Dict]:
+    def get_build_cloudwatch_metrics(self, build_id: str, start_time: datetime,
+                                     end_time: Optional[datetime] = None) -> Optional[Dict]:
         """Get CloudWatch metrics for CodeBuild execution"""
         
-        try:
-            # CodeBuild metrics are available in CloudWatch
-            end_time = start_time + timedelta(hours=2)  # Assume max 2 hour build
-            
-            # Get CPU utilization if available
-            cpu_response = self.cloudwatch.get_metric_statistics(
-                Namespace='AWS/CodeBuild',
-                MetricName='CPUUtilization',
-                Dimensions=[
-                    {'Name': 'BuildId', 'Value': build_id}
-                ],
-                StartTime=start_time,
-                EndTime=end_time,
-                Period=300,  # 5 minute periods
-                Statistics=['Average', 'Maximum']
-            )
-            
-            # Get memory utilization if available
-            memory_response = self.cloudwatch.get_metric_statistics(
-                Namespace='AWS/CodeBuild',
-                MetricName='MemoryUtilization',
-                Dimensions=[
-                    {'Name': 'BuildId', 'Value': build_id}
-                ],
-                StartTime=start_time,
-                EndTime=end_time,
-                Period=300,
-                Statistics=['Average', 'Maximum']
-            )
-            
-            metrics = {
-                'cpu_utilization': cpu_response.get('Datapoints', []),
-                'memory_utilization': memory_response.get('Datapoints', [])
-            }
-            
-            # Calculate averages
-            if metrics['cpu_utilization']:
-                avg_cpu = sum(dp['Average'] for dp in metrics['cpu_utilization']) / len(metrics['cpu_utilization'])
-                metrics['avg_cpu_percent'] = round(avg_cpu, 2)
-            
-            if metrics['memory_utilization']:
-                avg_memory = sum(dp['Average'] for dp in metrics['memory_utilization']) / len(metrics['memory_utilization'])
-                metrics['avg_memory_percent'] = round(avg_memory, 2)
+        return self._fetch_all_build_metrics([(build_id, start_time, end_time)]).get(build_id)
+    
+    def _fetch_all_build_metrics(self, build_windows: List[Tuple[str, datetime, Optional[datetime]]]) -> Dict[str, Optional[Dict]]:
+        """
+        Get CloudWatch CPU/Memory metrics for many builds with batched get_metric_data calls
+        
+        Args:
+            build_windows: (build_id, start_time, end_time) tuples; end_time is
+                None for builds still running
             
-            return metrics if (metrics['cpu_utilization'] or metrics['memory_utilization']) else None
+        Returns:
+            Dictionary of build_id to metrics (None when CloudWatch has no data)
+        """
+        
+        # Tighten each window to the build's actual run time (or now), capped at
+        # the maximum window, and drop builds too short to have datapoints
+        now = datetime.now(timezone.utc)
+        windows = []
+        for build_id, start, end in build_windows:
+            if not start:
+                continue
+            end = min(end or now, start + MAX_BUILD_METRICS_WINDOW)
+            if (end - start).total_seconds() >= MIN_BUILD_METRICS_WINDOW_SECONDS:
+                windows.append((build_id, start, end))
+        
+        builds_per_call = METRIC_DATA_QUERY_LIMIT // (len(BUILD_METRICS) * len(BUILD_METRIC_STATS))
+        results = {}
+        
+        try:
+            for i in range(0, len(windows), builds_per_call):
+                chunk = windows[i:i + builds_per_call]
+                
+                queries = [
+                    {
+                        'Id': f'{prefix}_{stat.lower()}_{index}',
+                        'MetricStat': {
+                            'Metric': {
+                                'Namespace': 'AWS/CodeBuild',
+                                'MetricName': metric_name,
+                                'Dimensions': [{'Name': 'BuildId', 'Value': build_id}]
+                            },
+                            'Period': 300,  # 5 minute periods
+                            'Stat': stat
+                        },
+                        'ReturnData': True
+                    }
+                    for index, (build_id, _, _) in enumerate(chunk)
+                    for prefix, metric_name in BUILD_METRICS
+                    for stat in BUILD_METRIC_STATS
+                ]
+                
+                # One time range covering every build window in the chunk
+                request = {
+                    'MetricDataQueries': queries,
+                    'StartTime': min(start for _, start, _ in chunk),
+                    'EndTime': max(end for _, _, end in chunk)
+                }
+                
+                # Demultiplex results back to (build index, metric) -> timestamp -> datapoint
+                datapoints = {}
+                while True:
+                    response = self.cloudwatch.get_metric_data(**request)
+                    
+                    for result in response.get('MetricDataResults', []):
+                        prefix, stat, index = result['Id'].split('_')
+                        series = datapoints.setdefault((int(index), prefix), {})
+                        
+                        for timestamp, value in zip(result.get('Timestamps', []), result.get('Values', [])):
+                            series.setdefault(timestamp, {'Timestamp': timestamp, 'Unit': 'Percent'})[stat.capitalize()] = value
+                    
+                    if not response.get('NextToken'):
+                        break
+                    request['NextToken'] = response['NextToken']
+                
+                for index, (build_id, _, _) in enumerate(chunk):
+                    metrics = {
+                        f'{prefix}_utilization': list(datapoints.get((index, prefix), {}).values())
+                        for prefix, _ in BUILD_METRICS
+                    }
+                    
+                    # Calculate averages
+                    cpu_averages = [dp['Average'] for dp in metrics['cpu_utilization'] if 'Average' in dp]
+                    if cpu_averages:
+                        metrics['avg_cpu_percent'] = round(statistics.fmean(cpu_averages), 2)
+                    
+                    memory_averages = [dp['Average'] for dp in metrics['memory_utilization'] if 'Average' in dp]
+                    if memory_averages:
+                        metrics['avg_memory_percent'] = round(statistics.fmean(memory_averages), 2)
+                    
+                    results[build_id] = metrics if (metrics['cpu_utilization'] or metrics['memory_utilization']) else None
             
         except Exception as e:
             logger.error(f"Error fetching CloudWatch metrics: {e}")
-            return None
+        
+        return results
     
     def get_commit_details(self, artifact_revision: Dict) -> Optional[Dict]:
         """Get commit details from CodeCommit"""
@@ -376,13 +586,9 @@ class AWSPipelineDataCollector:
             revision_id = artifact_revision.get('revisionId')
             revision_url = artifact_revision.get('revisionUrl', '')
             
-            # Extract repository name from URL if possible
-            repo_name = None
-            if 'codecommit' in revision_url:
-                # Parse repository name from CodeCommit URL
-                parts = revision_url.split('/')
-                if len(parts) > 1:
-                    repo_name = parts[-1].split('?')[0]
+            # Extract repository name from CodeCommit URL if possible
+            match = _CC_URL_RE.search(revision_url)
+            repo_name = (match.group(1) or match.group(2)) if match else None
             
             if not repo_name or not revision_id:
                 return {
@@ -428,7 +634,8 @@ class AWSPipelineDataCollector:
             pipeline_name: Name of the CodePipeline
             execution_id: Pipeline execution ID
             max_wait_minutes: Maximum time to wait
-            check_interval_seconds: How often to check status
+            check_interval_seconds: Initial delay between status checks; doubles
+                (with jitter) on each poll up to MAX_POLL_INTERVAL_SECONDS
             
         Returns:
             Final pipeline execution details
@@ -436,10 +643,10 @@ class AWSPipelineDataCollector:
         
         logger.info(f"Waiting for pipeline completion: {pipeline_name}/{execution_id}")
         
-        start_wait_time = datetime.now()
-        max_wait_time = start_wait_time + timedelta(minutes=max_wait_minutes)
+        deadline = time.monotonic() + max_wait_minutes * 60
+        attempt = 0
         
-        while datetime.now() < max_wait_time:
+        while time.monotonic() < deadline:
             try:
                 # Get current execution status
                 execution_response = self.codepipeline.get_pipeline_execution(
@@ -457,30 +664,69 @@ class AWSPipelineDataCollector:
                     # Get full details now that it's complete
                     return self.get_pipeline_execution_details(pipeline_name, execution_id)
                 
-                # Wait before next check
-                time.sleep(check_interval_seconds)
-                
             except Exception as e:
                 logger.error(f"Error checking pipeline status: {e}")
-                time.sleep(check_interval_seconds)
+            
+            # Back off exponentially with jitter, never sleeping past the deadline
+            interval = min(check_interval_seconds * 2 ** min(attempt, 4), MAX_POLL_INTERVAL_SECONDS)
+            interval += random.uniform(0, interval * 0.2)
+            time.sleep(max(0, min(interval, deadline - time.monotonic())))
+            attempt += 1
         
         # Timeout reached
         logger.warning(f"Timeout waiting for pipeline completion after {max_wait_minutes} minutes")
         return self.get_pipeline_execution_details(pipeline_name, execution_id)
 
 
+# One collector per region, reused across warm invocations. boto3 clients are
+# thread-safe, so a collector can be shared by concurrent calls.
+_COLLECTORS: Dict[str, AWSPipelineDataCollector] = {}
+
+
+def get_collector(region: str = 'eu-west-2') -> AWSPipelineDataCollector:
+    """Get the shared collector for a region, creating its clients on first use"""
+    collector = _COLLECTORS.get(region)
+    if collector is None:
+        collector = _COLLECTORS[region] = AWSPipelineDataCollector(region)
+    return collector
+
+
 # Convenience functions for Lambda integration
 def collect_pipeline_data(pipeline_name: str, execution_id: str, region: str = 'eu-west-2') -> Dict:
     """Collect comprehensive pipeline data"""
-    collector = AWSPipelineDataCollector(region)
-    return collector.get_pipeline_execution_details(pipeline_name, execution_id)
+    return get_collector(region).get_pipeline_execution_details(pipeline_name, execution_id)
 
 
 def wait_and_collect_pipeline_data(pipeline_name: str, execution_id: str, 
                                  region: str = 'eu-west-2', max_wait_minutes: int = 60) -> Dict:
     """Wait for pipeline completion and collect data"""
-    collector = AWSPipelineDataCollector(region)
-    return collector.wait_for_pipeline_completion(pipeline_name, execution_id, max_wait_minutes)
+    return get_collector(region).wait_for_pipeline_completion(pipeline_name, execution_id, max_wait_minutes)
+
+
+def _sci_coefficients(vcpu_count: float, memory_mb: float) -> Tuple[float, float, float]:
+    """
+    Per-hour SCI coefficients for a build environment
+    
+    Returns:
+        (energy kWh per hour including PUE, vCPUs, embodied gCO2 per hour)
+    """
+    
+    # CPU energy (10W per vCPU) plus memory energy (based on memory allocation)
+    cpu_kwh_per_hour = vcpu_count * 10 / 1000
+    memory_kwh_per_hour = memory_mb * 0.000392 / 1000
+    
+    return (
+        (cpu_kwh_per_hour + memory_kwh_per_hour) * PUE,
+        vcpu_count,
+        vcpu_count * EMBODIED_G_PER_VCPU_HOUR
+    )
+
+
+# Coefficients for the known compute types, computed once at import
+SCI_COEFFICIENTS = {
+    compute_type: _sci_coefficients(specs['vcpu'], specs['memory_mb'])
+    for compute_type, specs in COMPUTE_SPECS.items()
+}
 
 
 def calculate_accurate_sci(pipeline_data: Dict, carbon_intensity: float) -> Dict:
@@ -495,55 +741,49 @@ def calculate_accurate_sci(pipeline_data: Dict, carbon_intensity: float) -> Dict
         Accurate SCI calculation with breakdown
     """
     
-    # Constants
-    PUE = 1.15  # AWS PUE (2024 Sustainability Report)
-    EMBODIED_G_PER_VCPU_HOUR = 2.5  # Embodied carbon per vCPU-hour
-    
     total_energy_kwh = 0
     total_vcpu_hours = 0
     total_embodied_g = 0
     
-    # Calculate from actual build data
+    # Collect (energy kWh/h, vCPUs, embodied g/h, hours) rows from actual build data
+    rows = []
     for stage in pipeline_data.get('stages', []):
         for action in stage.get('actions', []):
             build_details = action.get('build_details')
             if build_details and build_details.get('duration_hours'):
                 
-                # Energy calculation
-                vcpu_count = build_details.get('vcpu_count', 2)
-                duration_hours = build_details.get('duration_hours', 0)
-                
-                # CPU energy (10W per vCPU)
-                cpu_energy_kwh = (vcpu_count * 10 * duration_hours) / 1000
+                # Known compute types use precomputed coefficients; anything
+                # else is derived from the recorded allocation
+                coefficients = SCI_COEFFICIENTS.get(build_details.get('compute_type'))
+                if coefficients is None:
+                    coefficients = _sci_coefficients(
+                        build_details.get('vcpu_count', 2),
+                        build_details.get('memory_mb', 3072)
+                    )
                 
-                # Memory energy (based on actual memory allocation)
-                memory_mb = build_details.get('memory_mb', 3072)
-                memory_energy_kwh = (memory_mb * duration_hours * 0.000392) / 1000
-                
-                # Apply PUE
-                action_energy_kwh = (cpu_energy_kwh + memory_energy_kwh) * PUE
-                total_energy_kwh += action_energy_kwh
-                
-                # Embodied carbon
-                vcpu_hours = vcpu_count * duration_hours
-                total_vcpu_hours += vcpu_hours
-                total_embodied_g += vcpu_hours * EMBODIED_G_PER_VCPU_HOUR
+                rows.append((*coefficients, build_details['duration_hours']))
+    
+    if NUMPY_AVAILABLE and len(rows) >= NUMPY_MIN_BUILDS:
+        # Weight each coefficient column by duration in a single dot product
+        arr = np.asarray(rows, dtype=np.float64)
+        total_energy_kwh, total_vcpu_hours, total_embodied_g = (float(v) for v in arr[:, 3] @ arr[:, :3])
+    else:
+        for energy_kwh_per_hour, vcpu_count, embodied_g_per_hour, duration_hours in rows:
+            total_energy_kwh += energy_kwh_per_hour * duration_hours
+            total_vcpu_hours += vcpu_count * duration_hours
+            total_embodied_g += embodied_g_per_hour * duration_hours
     
     # Fallback calculation if no build data
     if total_energy_kwh == 0:
-        # Use pipeline duration and estimated resources
+        # Use pipeline duration and estimated resources (default medium instance)
         duration_seconds = pipeline_data.get('duration_seconds', 0)
         if duration_seconds > 0:
             duration_hours = duration_seconds / 3600
-            estimated_vcpu = 4  # Default medium instance
-            estimated_memory_mb = 7168
-            
-            cpu_energy_kwh = (estimated_vcpu * 10 * duration_hours) / 1000
-            memory_energy_kwh = (estimated_memory_mb * duration_hours * 0.000392) / 1000
-            total_energy_kwh = (cpu_energy_kwh + memory_energy_kwh) * PUE
+            energy_kwh_per_hour, vcpu_count, embodied_g_per_hour = SCI_COEFFICIENTS['BUILD_GENERAL1_MEDIUM']
             
-            total_vcpu_hours = estimated_vcpu * duration_hours
-            total_embodied_g = total_vcpu_hours * EMBODIED_G_PER_VCPU_HOUR
+            total_energy_kwh = energy_kwh_per_hour * duration_hours
+            total_vcpu_hours = vcpu_count * duration_hours
+            total_embodied_g = embodied_g_per_hour * duration_hours
     
     # Calculate SCI
     operational_g = total_energy_kwh * carbon_intensity
@@ -15,23 +15,32 @@ References:
 - SCI: ((E × I) + M) per R
 """
 
+from array import array
+import bisect
+import heapq
 import boto3
+from botocore.config import Config
 import json
 import os
 import logging
 import sys
-from datetime import datetime, timedelta
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, List, Sequence, Tuple, Optional
 from dataclasses import dataclass
 from enum import Enum
 
-# Add parent paths for imports
+# Add parent paths for imports (repo root for config, lambda/ for sibling packages)
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 # Import pipeline trigger module
 try:
-    from lambda.schedule_optimizer.pipeline_trigger import (
+    from pipeline_trigger import (
         execute_pipeline_action,
         TriggerResult,
         TriggerStatus,
@@ -40,6 +49,36 @@ try:
 except ImportError:
     PIPELINE_TRIGGER_AVAILABLE = False
 
+# Import test history storage (used by run_optimized when bundled)
+try:
+    from api.test_history_handler import store_test_result
+    TEST_HISTORY_AVAILABLE = True
+except ImportError:
+    TEST_HISTORY_AVAILABLE = False
+
+# orjson is optional (add it via a Lambda layer); the stdlib encoder is the fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# NumPy is optional; long forecasts are scanned with it when available
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Numba is optional and opt-in (USE_NUMBA=true): importing it and compiling the
+# forecast scan adds noticeably to cold start, which only pays off in batch mode
+NUMBA_AVAILABLE = False
+if NUMPY_AVAILABLE and os.environ.get('USE_NUMBA', 'false').lower() == 'true':
+    try:
+        from numba import njit
+        NUMBA_AVAILABLE = True
+    except ImportError:
+        pass
+
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -50,6 +89,47 @@ logger.setLevel(logging.INFO)
 
 TABLE_NAME = os.environ.get('DYNAMODB_TABLE', 'green_qa_carbon_intensity')
 
+# Region queries are independent network calls, so they fan out on a shared pool
+REGION_FETCH_WORKERS = 16
+_REGION_FETCH_EXECUTOR = ThreadPoolExecutor(max_workers=REGION_FETCH_WORKERS)
+
+# Per-region batch recommendations run on their own pool: a recommendation may
+# itself fetch region data, which must not wait behind its caller on one pool
+_RECOMMENDATION_EXECUTOR = ThreadPoolExecutor(max_workers=REGION_FETCH_WORKERS)
+
+# DynamoDB resource and table are created once per container and shared by
+# the region fetch threads (boto3 resources are safe to share for reads here).
+# The connection pool matches the fetch pool so threads don't queue for sockets.
+dynamodb = boto3.resource('dynamodb', config=Config(
+    max_pool_connections=REGION_FETCH_WORKERS,
+    retries={'max_attempts': 2, 'mode': 'standard'}
+))
+carbon_table = dynamodb.Table(TABLE_NAME)
+
+# Latest carbon data per region, kept across warm invocations. Intensity is
+# ingested roughly every 30 minutes, so a few minutes of staleness is harmless.
+# Keyed by (region, whether the item includes the forecast).
+CARBON_CACHE_TTL = int(os.environ.get('CARBON_CACHE_TTL', '300'))
+_CACHE: Dict[Tuple[str, bool], Tuple[float, Dict]] = {}
+_CACHE_LOCK = threading.Lock()
+
+# Regions considered for relocation
+_REGIONS = (
+    'eu-west-2', 'eu-north-1', 'eu-west-1', 'eu-west-3', 'eu-central-1',
+    'us-east-1', 'us-east-2', 'us-west-1', 'us-west-2',
+    'ap-south-1', 'ap-northeast-1', 'ap-southeast-1', 'ap-southeast-2'
+)
+
+# Ingestion also writes each region's latest reading under this sort key, so
+# several regions can be read with one BatchGetItem (up to 100 keys per call)
+LATEST_MARKER_TIMESTAMP = 0
+BATCH_GET_ITEM_LIMIT = 100
+BATCH_GET_ITEM_ATTEMPTS = 3
+
+# Attributes needed for intensity-only decisions (everything but the forecast)
+SUMMARY_PROJECTION = 'region_id, carbon_intensity, #idx, #src'
+SUMMARY_ATTRIBUTE_NAMES = {'#idx': 'index', '#src': 'source'}
+
 # Thresholds from CATS (Climate-Aware Task Scheduler)
 # Source: Section 3 of knowledge base
 CARBON_THRESHOLD_VERY_LOW = 50     # Very low intensity
@@ -70,10 +150,24 @@ PUE_VALUES = {
     'gcp': 1.1,
     'azure': 1.185
 }
+_PUE_AWS = PUE_VALUES['aws']
 
 # Energy coefficient per vCPU (Watts)
 VCPU_TDP_WATTS = 10.0
 
+# Memory energy coefficient (kWh per GB-hour)
+MEMORY_KWH_PER_GB_HOUR = 0.000392
+
+# Embodied emissions per vCPU-hour (gCO2), used for SCI's M term
+EMBODIED_G_PER_VCPU_HOUR = 2.5
+
+# Per-second energy rates, derived once so calculate_energy_kwh is a single expression
+_VCPU_KWH_PER_SEC = VCPU_TDP_WATTS / 1000 / 3600
+_MEM_KWH_PER_SEC = MEMORY_KWH_PER_GB_HOUR / 3600
+
+# Forecasts with at least this many slots are scanned with NumPy when available
+NUMPY_MIN_FORECAST_SLOTS = 32
+
 
 # ============================================================================
 # DATA CLASSES (inspired by carbonaware_scheduler_client)
@@ -96,7 +190,28 @@ class CarbonIndex(Enum):
     VERY_HIGH = "very high"
 
 
-@dataclass
+# Upper bounds (inclusive) of each index band, and the index for each band;
+# the last index covers everything above CARBON_THRESHOLD_HIGH
+_THRESHOLDS = (
+    CARBON_THRESHOLD_VERY_LOW,
+    CARBON_THRESHOLD_LOW,
+    CARBON_THRESHOLD_MODERATE,
+    CARBON_THRESHOLD_HIGH,
+)
+_INDEX_VALUES = (
+    CarbonIndex.VERY_LOW.value,
+    CarbonIndex.LOW.value,
+    CarbonIndex.MODERATE.value,
+    CarbonIndex.HIGH.value,
+    CarbonIndex.VERY_HIGH.value,
+)
+
+# Index groups used by the decisions, built once instead of per call
+_LOW_INDICES = frozenset({CarbonIndex.VERY_LOW.value, CarbonIndex.LOW.value})
+_HIGH_INDICES = frozenset({CarbonIndex.HIGH.value, CarbonIndex.VERY_HIGH.value})
+
+
+@dataclass(slots=True)
 class CarbonWindow:
     """
     A time window with carbon intensity data.
@@ -116,7 +231,7 @@ class CarbonWindow:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class SchedulingRecommendation:
     """
     Scheduling recommendation result.
@@ -134,22 +249,31 @@ class SchedulingRecommendation:
     confidence: str = "medium"
     pipeline_trigger_result: Optional[Dict] = None
     
-    def to_dict(self) -> Dict:
+    def to_dict(self, timestamp: Optional[str] = None) -> Dict:
+        """
+        Serialize for API responses.
+        
+        Args:
+            timestamp: ISO timestamp shared by the whole invocation; computed
+                now if not supplied
+        """
         result = {
             'recommendation': self.recommendation.value,
             'reason': self.reason,
             'region': self.region,
             'current_intensity': self.current_intensity,
             'confidence': self.confidence,
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': timestamp or utc_timestamp()
         }
         
+        # Optional fields are only included when set
         if self.current_index:
             result['current_index'] = self.current_index
         
-        if self.optimal_window:
-            result['optimal_window'] = self.optimal_window.to_dict()
-            result['optimal_intensity'] = self.optimal_window.carbon_intensity
+        window = self.optimal_window
+        if window:
+            result['optimal_window'] = window.to_dict()
+            result['optimal_intensity'] = window.carbon_intensity
         
         if self.alternative_region:
             result['alternative_region'] = self.alternative_region
@@ -166,36 +290,83 @@ class SchedulingRecommendation:
         return result
 
 
+def utc_timestamp() -> str:
+    """Current UTC time as an ISO 8601 string."""
+    return datetime.now(timezone.utc).isoformat()
+
+
 # ============================================================================
-# JSON ENCODER
+# JSON SERIALIZATION
 # ============================================================================
 
-class DecimalEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return float(obj)
-        return super().default(obj)
+def _json_default(obj):
+    """Convert values the encoders don't handle natively (DynamoDB Decimals, datetimes, enums)."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps(value) -> str:
+    """Serialize a response body, using orjson when it is installed."""
+    if orjson is not None:
+        # Non-string keys are accepted to match json.dumps
+        return orjson.dumps(value, default=_json_default, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(value, default=_json_default)
 
 
 # ============================================================================
 # DATABASE ACCESS
 # ============================================================================
 
-def get_carbon_data(region: str) -> Optional[Dict]:
-    """Get latest carbon data from DynamoDB."""
-    dynamodb = boto3.resource('dynamodb')
-    table = dynamodb.Table(TABLE_NAME)
+def get_carbon_data(region: str, include_forecast: bool = True) -> Optional[Dict]:
+    """
+    Get latest carbon data from DynamoDB (cached for CARBON_CACHE_TTL seconds).
+    With include_forecast=False only intensity, index and source are fetched;
+    a cached full item satisfies that too.
+    """
+    return _get_cached(region, include_forecast) or _query_latest(region, include_forecast)
+
+
+def _get_cached(region: str, include_forecast: bool) -> Optional[Dict]:
+    keys = ((region, True),) if include_forecast else ((region, True), (region, False))
+    now = time.monotonic()
+    for key in keys:
+        cached = _CACHE.get(key)
+        if cached and now - cached[0] < CARBON_CACHE_TTL:
+            return cached[1]
+    return None
+
+
+def clear_carbon_cache() -> None:
+    """Drop cached carbon data (tests, or forcing a re-read after ingestion)."""
+    with _CACHE_LOCK:
+        _CACHE.clear()
+
+
+def _query_latest(region: str, include_forecast: bool) -> Optional[Dict]:
+    """Query the latest item for a region and cache it."""
+    query = {
+        'KeyConditionExpression': 'region_id = :r',
+        'ExpressionAttributeValues': {':r': region},
+        'ScanIndexForward': False,
+        'Limit': 1
+    }
+    if not include_forecast:
+        query['ProjectionExpression'] = SUMMARY_PROJECTION
+        query['ExpressionAttributeNames'] = SUMMARY_ATTRIBUTE_NAMES
     
     try:
-        response = table.query(
-            KeyConditionExpression='region_id = :r',
-            ExpressionAttributeValues={':r': region},
-            ScanIndexForward=False,
-            Limit=1
-        )
+        response = carbon_table.query(**query)
         
         if response['Items']:
-            return response['Items'][0]
+            item = _coerce_item(response['Items'][0])
+            with _CACHE_LOCK:
+                _CACHE[(region, include_forecast)] = (time.monotonic(), item)
+            return item
         return None
     
     except Exception as e:
@@ -203,21 +374,136 @@ def get_carbon_data(region: str) -> Optional[Dict]:
         return None
 
 
-def get_all_regions_data() -> List[Dict]:
+def _coerce_item(item: Dict) -> Dict:
+    """
+    Normalise a carbon item once at read time: Decimal numbers become floats
+    and the forecast becomes parallel arrays (see forecast_to_soa), read from
+    the compact forecast_blob when ingestion wrote one and from the JSON
+    'forecast' string otherwise. Items without a usable forecast have no
+    'forecast' key.
+    """
+    blob = item.pop('forecast_blob', None)
+    froms = item.pop('forecast_from', None)
+    tos = item.pop('forecast_to', None)
+    forecast = item.pop('forecast', None)
+    
+    item = _decimals_to_floats(item)
+    
+    if blob is not None and froms is not None and tos is not None:
+        intensities = array('d')
+        intensities.frombytes(getattr(blob, 'value', blob))
+        if sys.byteorder == 'big':
+            intensities.byteswap()  # stored little-endian
+        if intensities:
+            item['forecast'] = {'from': froms, 'to': tos, 'intensity': intensities}
+        return item
+    
+    if isinstance(forecast, str):
+        try:
+            forecast = json.loads(forecast)
+        except ValueError:
+            logger.warning(f"Unreadable forecast for {item.get('region_id')}")
+            forecast = None
+    if forecast:
+        item['forecast'] = forecast_to_soa(forecast)
+    
+    return item
+
+
+def forecast_to_soa(forecast: List[Dict]) -> Dict[str, Sequence]:
+    """
+    Split forecast slots into parallel 'from', 'to' and 'intensity' sequences.
+    Intensities go into a float64 array so window scans run over contiguous
+    numbers instead of looking up a dict per slot.
+    """
+    return {
+        'from': [slot.get('from', '') for slot in forecast],
+        'to': [slot.get('to', '') for slot in forecast],
+        'intensity': array('d', [float(slot.get('intensity', 9999)) for slot in forecast])
+    }
+
+
+def _decimals_to_floats(value):
+    """Recursively replace Decimal values with floats."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, dict):
+        return {k: _decimals_to_floats(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_decimals_to_floats(v) for v in value]
+    return value
+
+
+def get_all_regions_data(include_forecast: bool = True) -> List[Dict]:
     """Get latest data for all regions."""
-    regions = [
-        'eu-west-2', 'eu-north-1', 'eu-west-1', 'eu-west-3', 'eu-central-1',
-        'us-east-1', 'us-east-2', 'us-west-1', 'us-west-2',
-        'ap-south-1', 'ap-northeast-1', 'ap-southeast-1', 'ap-southeast-2'
-    ]
+    return [data for data in get_regions_data(_REGIONS, include_forecast).values() if data]
+
+
+def get_regions_data(
+    regions: Sequence[str],
+    include_forecast: bool = True
+) -> Dict[str, Optional[Dict]]:
+    """
+    Get latest data for several regions. Uncached regions are read in one
+    BatchGetItem of their latest-marker rows; regions without a marker (or
+    left unprocessed) fall back to concurrent queries.
+    """
+    data = {region: _get_cached(region, include_forecast) for region in regions}
     
-    results = []
-    for region in regions:
-        data = get_carbon_data(region)
-        if data:
-            results.append(data)
+    missing = [region for region, item in data.items() if item is None]
+    if missing:
+        data.update(_batch_get_latest(missing, include_forecast))
+        unresolved = [region for region in missing if data[region] is None]
+        if len(unresolved) == 1:
+            # Nothing to overlap; skip the hand-off to a pool thread
+            data[unresolved[0]] = get_carbon_data(unresolved[0], include_forecast)
+        elif unresolved:
+            fetched = _REGION_FETCH_EXECUTOR.map(
+                lambda region: get_carbon_data(region, include_forecast), unresolved
+            )
+            data.update(zip(unresolved, fetched))
     
-    return results
+    return data
+
+
+def _batch_get_latest(regions: List[str], include_forecast: bool = True) -> Dict[str, Dict]:
+    """Read the latest-marker rows for regions with BatchGetItem and cache them."""
+    found = {}
+    try:
+        for start in range(0, len(regions), BATCH_GET_ITEM_LIMIT):
+            request = {TABLE_NAME: {'Keys': [
+                {'region_id': region, 'timestamp': LATEST_MARKER_TIMESTAMP}
+                for region in regions[start:start + BATCH_GET_ITEM_LIMIT]
+            ]}}
+            if not include_forecast:
+                request[TABLE_NAME]['ProjectionExpression'] = SUMMARY_PROJECTION
+                request[TABLE_NAME]['ExpressionAttributeNames'] = SUMMARY_ATTRIBUTE_NAMES
+            
+            # Throttled keys come back as UnprocessedKeys; whatever is still
+            # unprocessed after a few attempts is queried individually
+            for _ in range(BATCH_GET_ITEM_ATTEMPTS):
+                response = dynamodb.batch_get_item(RequestItems=request)
+                for raw in response.get('Responses', {}).get(TABLE_NAME, []):
+                    item = _coerce_item(raw)
+                    found[item['region_id']] = item
+                request = response.get('UnprocessedKeys')
+                if not request:
+                    break
+    
+    except Exception as e:
+        logger.error(f"DynamoDB batch get error: {e}")
+    
+    now = time.monotonic()
+    with _CACHE_LOCK:
+        for region, item in found.items():
+            _CACHE[(region, include_forecast)] = (now, item)
+    return found
+
+
+# Prime credentials and the HTTPS connection during Lambda init so the first
+# invocation doesn't pay for them; skipped outside Lambda (tests, local runs)
+if os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
+    get_carbon_data('eu-west-2')
 
 
 # ============================================================================
@@ -233,15 +519,9 @@ def calculate_energy_kwh(
     Calculate energy consumption in kWh.
     Uses Cloud Carbon Footprint methodology.
     """
-    duration_hours = duration_seconds / 3600
-    
-    # Compute energy
-    compute_kwh = (vcpu_count * VCPU_TDP_WATTS * duration_hours) / 1000
-    
-    # Memory energy (0.000392 kWh per GB-hour)
-    memory_kwh = memory_gb * duration_hours * 0.000392 if memory_gb else 0
-    
-    return compute_kwh + memory_kwh
+    # Compute energy plus memory energy (MEMORY_KWH_PER_GB_HOUR)
+    memory_rate = memory_gb * _MEM_KWH_PER_SEC if memory_gb else 0
+    return duration_seconds * (vcpu_count * _VCPU_KWH_PER_SEC + memory_rate)
 
 
 def calculate_carbon_g(
@@ -269,10 +549,10 @@ def calculate_savings(
     Returns:
         Tuple of (savings in grams, savings as percentage)
     """
-    current_carbon = calculate_carbon_g(energy_kwh, current_intensity, pue)
-    optimal_carbon = calculate_carbon_g(energy_kwh, optimal_intensity, pue)
-    
-    savings_g = current_carbon - optimal_carbon
+    # Same as the difference of two calculate_carbon_g calls, in one step
+    energy_with_pue = energy_kwh * pue
+    current_carbon = energy_with_pue * current_intensity
+    savings_g = energy_with_pue * (current_intensity - optimal_intensity)
     savings_percent = (savings_g / current_carbon * 100) if current_carbon > 0 else 0
     
     return savings_g, savings_percent
@@ -287,20 +567,12 @@ def get_carbon_index(intensity: float) -> str:
     Determine carbon index from intensity.
     Pattern from UK Carbon Intensity API.
     """
-    if intensity <= CARBON_THRESHOLD_VERY_LOW:
-        return CarbonIndex.VERY_LOW.value
-    elif intensity <= CARBON_THRESHOLD_LOW:
-        return CarbonIndex.LOW.value
-    elif intensity <= CARBON_THRESHOLD_MODERATE:
-        return CarbonIndex.MODERATE.value
-    elif intensity <= CARBON_THRESHOLD_HIGH:
-        return CarbonIndex.HIGH.value
-    else:
-        return CarbonIndex.VERY_HIGH.value
+    # bisect_left puts a value equal to a threshold in that threshold's band
+    return _INDEX_VALUES[bisect.bisect_left(_THRESHOLDS, intensity)]
 
 
 def find_optimal_window(
-    forecast: List[Dict],
+    forecast: Dict[str, Sequence],
     duration_minutes: int = 30,
     max_defer_hours: int = MAX_DEFER_HOURS
 ) -> Optional[CarbonWindow]:
@@ -309,7 +581,8 @@ def find_optimal_window(
     Pattern from CATS and carbonaware_scheduler_client.
     
     Args:
-        forecast: List of forecast points with 'from', 'to', 'intensity'
+        forecast: Forecast as parallel 'from', 'to' and 'intensity' sequences
+            (see forecast_to_soa; get_carbon_data returns it in this form)
         duration_minutes: Expected workload duration
         max_defer_hours: Maximum hours to look ahead
     
@@ -319,71 +592,134 @@ def find_optimal_window(
     if not forecast:
         return None
     
-    # Limit to max defer window
+    # Limit to max defer window by bounding the scan rather than copying
     max_slots = (max_defer_hours * 60) // 30  # 30-min slots
-    forecast = forecast[:min(len(forecast), max_slots)]
-    
-    # Find window with minimum intensity
-    best_window = None
-    best_intensity = float('inf')
+    intensities = forecast['intensity']
+    n = min(len(intensities), max_slots)
     
     slots_needed = max(1, duration_minutes // 30)
+    if n < slots_needed:
+        return None
+    
+    if slots_needed == 1:
+        # Single-slot workloads: the window is just the lowest slot
+        i = min(range(n), key=intensities.__getitem__)
+        return _forecast_window(forecast, i, slots_needed, intensities[i])
+    
+    if NUMBA_AVAILABLE and n >= NUMPY_MIN_FORECAST_SLOTS:
+        i, avg_intensity = _scan_forecast(np.asarray(intensities)[:n], slots_needed)
+        return _forecast_window(forecast, int(i), slots_needed, float(avg_intensity))
+    
+    if NUMPY_AVAILABLE and n >= NUMPY_MIN_FORECAST_SLOTS:
+        # All window sums from one cumulative sum (O(n) regardless of window
+        # length, unlike a convolution); argmin picks the earliest best
+        cumulative = np.concatenate(([0.0], np.cumsum(np.asarray(intensities)[:n])))
+        sums = cumulative[slots_needed:] - cumulative[:-slots_needed]
+        i = int(np.argmin(sums))
+        return _forecast_window(forecast, i, slots_needed, float(sums[i]) / slots_needed)
+    
+    # Slide the window with a running sum: add the incoming slot, drop the
+    # outgoing one. Comparing sums avoids dividing on every position, and the
+    # window is only built once the best start is known.
+    window_sum = sum(intensities[:slots_needed])
+    best_sum = window_sum
+    best_i = 0
     
-    for i in range(len(forecast) - slots_needed + 1):
-        window_slots = forecast[i:i + slots_needed]
+    for i in range(1, n - slots_needed + 1):
+        window_sum += intensities[i + slots_needed - 1] - intensities[i - 1]
         
-        # Calculate average intensity across window
-        avg_intensity = sum(
-            float(s.get('intensity', 9999)) for s in window_slots
-        ) / len(window_slots)
+        if window_sum < best_sum:
+            best_sum = window_sum
+            best_i = i
+    
+    return _forecast_window(forecast, best_i, slots_needed, best_sum / slots_needed)
+
+
+if NUMBA_AVAILABLE:
+    @njit
+    def _scan_forecast(intensities, slots_needed):
+        """Compiled running-sum scan; returns (best start index, best average)."""
+        window_sum = 0.0
+        for j in range(slots_needed):
+            window_sum += intensities[j]
+        best_sum = window_sum
+        best_i = 0
         
-        if avg_intensity < best_intensity:
-            best_intensity = avg_intensity
-            best_window = CarbonWindow(
-                start_time=window_slots[0].get('from', ''),
-                end_time=window_slots[-1].get('to', ''),
-                carbon_intensity=avg_intensity,
-                index=get_carbon_index(avg_intensity)
-            )
+        for i in range(1, intensities.shape[0] - slots_needed + 1):
+            window_sum += intensities[i + slots_needed - 1] - intensities[i - 1]
+            if window_sum < best_sum:
+                best_sum = window_sum
+                best_i = i
+        
+        return best_i, best_sum / slots_needed
     
-    return best_window
+    # Compile during init so the first request doesn't pay for it
+    _scan_forecast(np.zeros(4), 2)
+
+
+def _forecast_window(
+    forecast: Dict[str, Sequence],
+    start: int,
+    slots_needed: int,
+    avg_intensity: float
+) -> CarbonWindow:
+    """Build the CarbonWindow covering slots start to start + slots_needed - 1."""
+    return CarbonWindow(
+        start_time=forecast['from'][start],
+        end_time=forecast['to'][start + slots_needed - 1],
+        carbon_intensity=avg_intensity,
+        index=get_carbon_index(avg_intensity)
+    )
+
+
+def _intensity_key(item: Dict) -> float:
+    """Sort key for carbon items; intensities are floats after _coerce_item."""
+    return item.get('carbon_intensity', 9999)
 
 
 def find_lowest_carbon_region(
     exclude_region: str = None,
-    max_results: int = 3
+    max_results: int = 3,
+    exclude_regions: Optional[Iterable[str]] = None
 ) -> List[Dict]:
     """
     Find regions with lowest current carbon intensity.
     Used for location-shifting recommendations.
+    
+    Args:
+        exclude_region: Region to leave out (typically the current one)
+        max_results: Number of regions to return
+        exclude_regions: Further regions to leave out
     """
-    all_data = get_all_regions_data()
+    all_data = get_all_regions_data(include_forecast=False)
     
-    # Filter and sort
-    filtered = [
-        d for d in all_data
-        if d.get('region_id') != exclude_region
-    ]
+    excluded = set(exclude_regions or ())
+    if exclude_region:
+        excluded.add(exclude_region)
     
-    sorted_data = sorted(
-        filtered,
-        key=lambda x: float(x.get('carbon_intensity', 9999))
+    # Filter and take the lowest few without building an intermediate list;
+    # region_id is the table's partition key, so every item has it
+    lowest = heapq.nsmallest(
+        max_results,
+        (d for d in all_data if d['region_id'] not in excluded),
+        key=_intensity_key
     )
     
     return [
         {
             'region': d['region_id'],
-            'intensity': float(d['carbon_intensity']),
+            'intensity': d['carbon_intensity'],
             'source': d.get('source')
         }
-        for d in sorted_data[:max_results]
+        for d in lowest
     ]
 
 
 def _trigger_pipeline_for_recommendation(
     recommendation: SchedulingRecommendation,
     region: str,
-    workload_type: str = None
+    workload_type: str = None,
+    timestamp: Optional[str] = None
 ) -> SchedulingRecommendation:
     """
     Helper to trigger pipeline based on recommendation.
@@ -414,7 +750,7 @@ def _trigger_pipeline_for_recommendation(
             carbon_intensity=recommendation.current_intensity,
             estimated_savings=recommendation.estimated_savings_percent
         )
-        recommendation.pipeline_trigger_result = trigger_result.to_dict()
+        recommendation.pipeline_trigger_result = trigger_result.to_dict(timestamp)
     except Exception as e:
         logger.error(f"Pipeline trigger failed: {e}")
         recommendation.pipeline_trigger_result = {
@@ -436,7 +772,9 @@ def get_scheduling_recommendation(
     allow_relocate: bool = False,
     max_defer_hours: int = MAX_DEFER_HOURS,
     workload_type: str = None,
-    trigger_pipeline: bool = False
+    trigger_pipeline: bool = False,
+    carbon_data: Optional[Dict] = None,
+    timestamp: Optional[str] = None
 ) -> SchedulingRecommendation:
     """
     Get intelligent scheduling recommendation.
@@ -456,6 +794,10 @@ def get_scheduling_recommendation(
         max_defer_hours: Maximum hours to defer
         workload_type: Type of workload (for pipeline lookup)
         trigger_pipeline: If True, actually trigger the pipeline
+        carbon_data: Latest carbon data for the region if the caller already
+            fetched it; queried from DynamoDB otherwise
+        timestamp: ISO timestamp shared by the whole invocation, used for the
+            pipeline trigger result; computed when the trigger runs if not supplied
     
     Decision logic:
     1. If intensity is very low/low → run now
@@ -463,37 +805,47 @@ def get_scheduling_recommendation(
     3. If relocating can save >30% → suggest relocation
     4. Otherwise → run with appropriate confidence
     """
-    # Get current carbon data
-    carbon_data = get_carbon_data(region)
+    rec = _build_recommendation(
+        region, duration_minutes, vcpu_count, memory_gb,
+        allow_defer, allow_relocate, max_defer_hours, carbon_data
+    )
+    if trigger_pipeline:
+        rec = _trigger_pipeline_for_recommendation(rec, region, workload_type, timestamp)
+    return rec
+
+
+def _build_recommendation(
+    region: str,
+    duration_minutes: int,
+    vcpu_count: int,
+    memory_gb: float,
+    allow_defer: bool,
+    allow_relocate: bool,
+    max_defer_hours: int,
+    carbon_data: Optional[Dict]
+) -> SchedulingRecommendation:
+    """Decision logic behind get_scheduling_recommendation (no pipeline trigger)."""
+    # Get current carbon data; the forecast is only needed when deferral is allowed
+    if carbon_data is None:
+        carbon_data = get_carbon_data(region, include_forecast=allow_defer)
     
     if not carbon_data:
-        rec = SchedulingRecommendation(
+        return SchedulingRecommendation(
             recommendation=RecommendationType.RUN_NOW,
             reason="No carbon data available, defaulting to immediate execution",
             region=region,
             current_intensity=300,  # Fallback
             confidence="low"
         )
-        if trigger_pipeline:
-            rec = _trigger_pipeline_for_recommendation(rec, region, workload_type)
-        return rec
     
     current_intensity = float(carbon_data.get('carbon_intensity', 300))
     current_index = carbon_data.get('index') or get_carbon_index(current_intensity)
-    forecast = carbon_data.get('forecast', [])
-    
-    # Calculate energy for savings estimation
-    energy_kwh = calculate_energy_kwh(
-        duration_seconds=duration_minutes * 60,
-        vcpu_count=vcpu_count,
-        memory_gb=memory_gb
-    )
     
     # ============================================================
     # DECISION 1: Check if intensity is already low
     # ============================================================
-    if current_index in [CarbonIndex.VERY_LOW.value, CarbonIndex.LOW.value]:
-        rec = SchedulingRecommendation(
+    if current_index in _LOW_INDICES:
+        return SchedulingRecommendation(
             recommendation=RecommendationType.RUN_NOW,
             reason=f"Carbon intensity is {current_index} ({current_intensity:.0f} gCO2/kWh) - optimal to run now",
             region=region,
@@ -501,9 +853,18 @@ def get_scheduling_recommendation(
             current_index=current_index,
             confidence="high"
         )
-        if trigger_pipeline:
-            rec = _trigger_pipeline_for_recommendation(rec, region, workload_type)
-        return rec
+    
+    forecast = carbon_data.get('forecast')
+    
+    # Calculate energy for savings estimation. Savings below are inlined from
+    # calculate_savings: grams scale with energy * PUE, while the percentage is
+    # just the relative intensity drop (zero when there is no energy to save)
+    energy_kwh = calculate_energy_kwh(
+        duration_seconds=duration_minutes * 60,
+        vcpu_count=vcpu_count,
+        memory_gb=memory_gb
+    )
+    energy_with_pue = energy_kwh * _PUE_AWS
     
     # ============================================================
     # DECISION 2: Check if time-shifting would help
@@ -516,16 +877,14 @@ def get_scheduling_recommendation(
         )
         
         if optimal_window and optimal_window.carbon_intensity < current_intensity:
-            improvement = (current_intensity - optimal_window.carbon_intensity) / current_intensity
+            intensity_drop = current_intensity - optimal_window.carbon_intensity
+            improvement = intensity_drop / current_intensity
             
             if improvement >= DEFER_BENEFIT_THRESHOLD:
-                savings_g, savings_percent = calculate_savings(
-                    current_intensity,
-                    optimal_window.carbon_intensity,
-                    energy_kwh
-                )
+                savings_g = intensity_drop * energy_with_pue
+                savings_percent = improvement * 100 if energy_with_pue > 0 else 0
                 
-                rec = SchedulingRecommendation(
+                return SchedulingRecommendation(
                     recommendation=RecommendationType.DEFER,
                     reason=f"Deferring to {optimal_window.start_time} can reduce carbon by {improvement:.0%}",
                     region=region,
@@ -536,9 +895,6 @@ def get_scheduling_recommendation(
                     estimated_savings_percent=savings_percent,
                     confidence="high"
                 )
-                if trigger_pipeline:
-                    rec = _trigger_pipeline_for_recommendation(rec, region, workload_type)
-                return rec
     
     # ============================================================
     # DECISION 3: Check if location-shifting would help
@@ -552,13 +908,11 @@ def get_scheduling_recommendation(
             
             # Recommend relocation if >30% improvement
             if alt_intensity < current_intensity * 0.7:
-                savings_g, savings_percent = calculate_savings(
-                    current_intensity,
-                    alt_intensity,
-                    energy_kwh
-                )
+                intensity_drop = current_intensity - alt_intensity
+                savings_g = intensity_drop * energy_with_pue
+                savings_percent = intensity_drop / current_intensity * 100 if energy_with_pue > 0 else 0
                 
-                rec = SchedulingRecommendation(
+                return SchedulingRecommendation(
                     recommendation=RecommendationType.RELOCATE,
                     reason=f"Running in {best_alt['region']} would reduce carbon by {savings_percent:.0f}%",
                     region=region,
@@ -574,15 +928,12 @@ def get_scheduling_recommendation(
                     estimated_savings_percent=savings_percent,
                     confidence="medium"
                 )
-                if trigger_pipeline:
-                    rec = _trigger_pipeline_for_recommendation(rec, region, workload_type)
-                return rec
     
     # ============================================================
     # DECISION 4: No better option, run with appropriate warning
     # ============================================================
-    if current_index in [CarbonIndex.HIGH.value, CarbonIndex.VERY_HIGH.value]:
-        rec = SchedulingRecommendation(
+    if current_index in _HIGH_INDICES:
+        return SchedulingRecommendation(
             recommendation=RecommendationType.RUN_WITH_WARNING,
             reason=f"Carbon intensity is {current_index} ({current_intensity:.0f} gCO2/kWh), but no better alternatives found",
             region=region,
@@ -590,11 +941,8 @@ def get_scheduling_recommendation(
             current_index=current_index,
             confidence="medium"
         )
-        if trigger_pipeline:
-            rec = _trigger_pipeline_for_recommendation(rec, region, workload_type)
-        return rec
     
-    rec = SchedulingRecommendation(
+    return SchedulingRecommendation(
         recommendation=RecommendationType.RUN_NOW,
         reason=f"Carbon intensity is moderate ({current_intensity:.0f} gCO2/kWh), no significant benefit from deferring",
         region=region,
@@ -602,9 +950,6 @@ def get_scheduling_recommendation(
         current_index=current_index,
         confidence="medium"
     )
-    if trigger_pipeline:
-        rec = _trigger_pipeline_for_recommendation(rec, region, workload_type)
-    return rec
 
 
 # ============================================================================
@@ -614,7 +959,8 @@ def get_scheduling_recommendation(
 def get_batch_recommendations(
     regions: List[str],
     duration_minutes: int = 30,
-    vcpu_count: int = 2
+    vcpu_count: int = 2,
+    timestamp: Optional[str] = None
 ) -> Dict:
     """
     Get recommendations for multiple regions.
@@ -622,17 +968,27 @@ def get_batch_recommendations(
     
     Returns sorted recommendations with the best option first.
     """
-    results = []
+    timestamp = timestamp or utc_timestamp()
     
-    for region in regions:
+    # Fetch every region's data once, concurrently, before deciding
+    data_by_region = get_regions_data(regions)
+    
+    def recommend(region: str) -> Dict:
         rec = get_scheduling_recommendation(
             region=region,
             duration_minutes=duration_minutes,
             vcpu_count=vcpu_count,
             allow_defer=True,
-            allow_relocate=False
+            allow_relocate=False,
+            carbon_data=data_by_region.get(region)
         )
-        results.append(rec.to_dict())
+        return rec.to_dict(timestamp)
+    
+    # Regions are independent; map() keeps region order so ties sort as before
+    if len(regions) > 1:
+        results = list(_RECOMMENDATION_EXECUTOR.map(recommend, regions))
+    else:
+        results = [recommend(region) for region in regions]
     
     # Sort by current intensity
     results.sort(key=lambda x: x.get('current_intensity', 9999))
@@ -641,10 +997,95 @@ def get_batch_recommendations(
         'recommendations': results,
         'best_region': results[0]['region'] if results else None,
         'best_intensity': results[0]['current_intensity'] if results else None,
-        'timestamp': datetime.utcnow().isoformat()
+        'timestamp': timestamp
     }
 
 
+def get_horizon_recommendations(
+    forecast: Dict[str, Sequence],
+    duration_minutes: int = 30,
+    max_defer_hours: int = MAX_DEFER_HOURS
+) -> List[Dict]:
+    """
+    Recommendation for starting the workload at each slot of a forecast, as
+    used for backtests and what-if views over the whole horizon.
+    
+    Applies the time-based decisions of get_scheduling_recommendation (run now
+    when low, defer when the best reachable window is enough better, warn
+    when high) with every slot in turn taken as "now". Relocation is not
+    considered since the forecast covers a single region.
+    
+    Window sums are computed once, and the best window reachable from each
+    slot comes from a sliding minimum, so the whole horizon costs O(slots)
+    rather than a find_optimal_window scan per slot.
+    """
+    if not forecast:
+        return []
+    
+    intensities = forecast['intensity']
+    froms, tos = forecast['from'], forecast['to']
+    total = len(intensities)
+    slots_needed = max(1, duration_minutes // 30)
+    max_slots = (max_defer_hours * 60) // 30  # 30-min slots
+    
+    # Sum of every window of slots_needed slots, by start index
+    window_sums = []
+    if total >= slots_needed:
+        window_sum = sum(intensities[:slots_needed])
+        window_sums.append(window_sum)
+        for j in range(1, total - slots_needed + 1):
+            window_sum += intensities[j + slots_needed - 1] - intensities[j - 1]
+            window_sums.append(window_sum)
+    
+    # Candidate window starts with increasing sums; the front is the earliest
+    # lowest window still reachable from the current slot
+    candidates = deque()
+    next_start = 0
+    results = []
+    
+    for t in range(total):
+        current = intensities[t]
+        current_index = get_carbon_index(current)
+        entry = {
+            'from': froms[t],
+            'current_intensity': current,
+            'current_index': current_index
+        }
+        results.append(entry)
+        
+        last_start = min(t + max_slots, total) - slots_needed
+        while next_start <= last_start:
+            while candidates and window_sums[candidates[-1]] > window_sums[next_start]:
+                candidates.pop()
+            candidates.append(next_start)
+            next_start += 1
+        while candidates and candidates[0] < t:
+            candidates.popleft()
+        
+        if current_index in _LOW_INDICES:
+            entry['recommendation'] = RecommendationType.RUN_NOW.value
+            continue
+        
+        if candidates and current > 0:
+            best = candidates[0]
+            optimal = window_sums[best] / slots_needed
+            improvement = (current - optimal) / current
+            if improvement >= DEFER_BENEFIT_THRESHOLD:
+                entry['recommendation'] = RecommendationType.DEFER.value
+                entry['optimal_start'] = froms[best]
+                entry['optimal_end'] = tos[best + slots_needed - 1]
+                entry['optimal_intensity'] = optimal
+                entry['estimated_savings_percent'] = round(improvement * 100, 1)
+                continue
+        
+        entry['recommendation'] = (
+            RecommendationType.RUN_WITH_WARNING.value if current_index in _HIGH_INDICES
+            else RecommendationType.RUN_NOW.value
+        )
+    
+    return results
+
+
 # ============================================================================
 # LAMBDA HANDLER
 # ============================================================================
@@ -658,9 +1099,13 @@ def lambda_handler(event: Dict, context) -> Dict:
         - batch: Multi-region recommendations
         - get_optimal_regions: Find lowest-carbon regions
         - calculate_savings: Calculate savings for deferral
+        - get_horizon: Recommendation for each slot of a region's forecast
     """
     action = event.get('action', 'get_recommendation')
     
+    # One timestamp for every object serialized in this invocation
+    timestamp = utc_timestamp()
+    
     try:
         if action == 'get_recommendation':
             rec = get_scheduling_recommendation(
@@ -672,13 +1117,14 @@ def lambda_handler(event: Dict, context) -> Dict:
                 allow_relocate=event.get('allow_relocate', False),
                 max_defer_hours=event.get('max_defer_hours', MAX_DEFER_HOURS),
                 workload_type=event.get('workload_type'),
-                trigger_pipeline=event.get('trigger_pipeline', False)
+                trigger_pipeline=event.get('trigger_pipeline', False),
+                timestamp=timestamp
             )
             
             return {
                 'statusCode': 200,
                 'headers': {'Content-Type': 'application/json'},
-                'body': json.dumps(rec.to_dict(), cls=DecimalEncoder)
+                'body': _dumps(rec.to_dict(timestamp))
             }
         
         elif action == 'batch':
@@ -686,13 +1132,14 @@ def lambda_handler(event: Dict, context) -> Dict:
             result = get_batch_recommendations(
                 regions=regions,
                 duration_minutes=event.get('duration_minutes', 30),
-                vcpu_count=event.get('vcpu_count', 2)
+                vcpu_count=event.get('vcpu_count', 2),
+                timestamp=timestamp
             )
             
             return {
                 'statusCode': 200,
                 'headers': {'Content-Type': 'application/json'},
-                'body': json.dumps(result, cls=DecimalEncoder)
+                'body': _dumps(result)
             }
         
         elif action == 'get_optimal_regions':
@@ -702,9 +1149,28 @@ def lambda_handler(event: Dict, context) -> Dict:
             return {
                 'statusCode': 200,
                 'headers': {'Content-Type': 'application/json'},
-                'body': json.dumps({
+                'body': _dumps({
                     'optimal_regions': regions,
-                    'timestamp': datetime.utcnow().isoformat()
+                    'timestamp': timestamp
+                })
+            }
+        
+        elif action == 'get_horizon':
+            region = event.get('region', 'eu-west-2')
+            data = get_carbon_data(region)
+            horizon = get_horizon_recommendations(
+                data.get('forecast') if data else None,
+                duration_minutes=event.get('duration_minutes', 30),
+                max_defer_hours=event.get('max_defer_hours', MAX_DEFER_HOURS)
+            )
+            
+            return {
+                'statusCode': 200,
+                'headers': {'Content-Type': 'application/json'},
+                'body': _dumps({
+                    'region': region,
+                    'horizon': horizon,
+                    'timestamp': timestamp
                 })
             }
         
@@ -719,7 +1185,7 @@ def lambda_handler(event: Dict, context) -> Dict:
             
             return {
                 'statusCode': 200,
-                'body': json.dumps({
+                'body': _dumps({
                     'current_intensity': current,
                     'optimal_intensity': optimal,
                     'energy_kwh': round(energy, 6),
@@ -763,7 +1229,8 @@ def lambda_handler(event: Dict, context) -> Dict:
                 allow_defer=True,
                 allow_relocate=True,
                 workload_type=workload_type,
-                trigger_pipeline=trigger_pipeline
+                trigger_pipeline=trigger_pipeline,
+                timestamp=timestamp
             )
             
             # Determine optimal region from recommendation
@@ -774,29 +1241,17 @@ def lambda_handler(event: Dict, context) -> Dict:
                 optimal_region = rec.region
                 optimal_intensity = rec.current_intensity
             
-            # Get default region intensity
-            default_data = get_carbon_data(default_region)
-            default_intensity = float(default_data.get('carbon_intensity', 250)) if default_data else 250
+            # Default region intensity, as already read for the recommendation
+            default_intensity = rec.current_intensity
             
             # Step 2: Calculate SCI for both regions
-            duration_hours = duration_minutes / 60
-            pue = PUE_VALUES.get('aws', 1.15)
-            
-            # Energy calculation
-            compute_kwh = (vcpu_count * VCPU_TDP_WATTS * duration_hours) / 1000
-            memory_kwh = memory_gb * duration_hours * 0.000392
-            total_energy_kwh = (compute_kwh + memory_kwh) * pue
-            
-            # Embodied carbon
-            embodied_g = vcpu_count * duration_hours * 2.5
+            # Energy (with PUE) and embodied carbon are the same for both regions
+            total_energy_kwh = calculate_energy_kwh(duration_minutes * 60, vcpu_count, memory_gb) * _PUE_AWS
+            embodied_g = vcpu_count * duration_minutes / 60 * EMBODIED_G_PER_VCPU_HOUR
             
-            # SCI for default region (eu-west-2)
-            default_operational_g = total_energy_kwh * default_intensity
-            default_sci = default_operational_g + embodied_g
-            
-            # SCI for optimal region
-            optimal_operational_g = total_energy_kwh * optimal_intensity
-            optimal_sci = optimal_operational_g + embodied_g
+            # SCI for default region (eu-west-2) and optimal region
+            default_sci = total_energy_kwh * default_intensity + embodied_g
+            optimal_sci = total_energy_kwh * optimal_intensity + embodied_g
             
             # Step 3: Calculate savings
             savings_g = default_sci - optimal_sci
@@ -805,7 +1260,7 @@ def lambda_handler(event: Dict, context) -> Dict:
             # Step 4: Build result
             result = {
                 'test_suite': test_suite,
-                'timestamp': datetime.utcnow().isoformat(),
+                'timestamp': timestamp,
                 
                 # Workload parameters
                 'duration_minutes': duration_minutes,
@@ -845,24 +1300,24 @@ def lambda_handler(event: Dict, context) -> Dict:
                 result['pipeline_message'] = rec.pipeline_trigger_result.get('message')
             
             # Step 5: Store in history (if history handler is available)
-            try:
-                from lambda.api.test_history_handler import store_test_result
-                stored = store_test_result({
-                    'test_suite': test_suite,
-                    'duration_minutes': duration_minutes,
-                    'vcpu_count': vcpu_count,
-                    'memory_gb': memory_gb,
-                    'optimal_region': optimal_region,
-                    'optimal_intensity': optimal_intensity,
-                    'pipeline_status': result['pipeline_status'],
-                    'pipeline_execution_id': result.get('pipeline_execution_id', ''),
-                    'recommendation': rec.recommendation.value
-                })
-                result['history_stored'] = True
-                result['test_id'] = stored.get('test_id')
-            except Exception as e:
-                logger.warning(f"Could not store test history: {e}")
-                result['history_stored'] = False
+            result['history_stored'] = False
+            if TEST_HISTORY_AVAILABLE:
+                try:
+                    stored = store_test_result({
+                        'test_suite': test_suite,
+                        'duration_minutes': duration_minutes,
+                        'vcpu_count': vcpu_count,
+                        'memory_gb': memory_gb,
+                        'optimal_region': optimal_region,
+                        'optimal_intensity': optimal_intensity,
+                        'pipeline_status': result['pipeline_status'],
+                        'pipeline_execution_id': result.get('pipeline_execution_id', ''),
+                        'recommendation': rec.recommendation.value
+                    })
+                    result['history_stored'] = True
+                    result['test_id'] = stored.get('test_id')
+                except Exception as e:
+                    logger.warning(f"Could not store test history: {e}")
             
             return {
                 'statusCode': 200,
@@ -870,20 +1325,20 @@ def lambda_handler(event: Dict, context) -> Dict:
                     'Content-Type': 'application/json',
                     'Access-Control-Allow-Origin': '*'
                 },
-                'body': json.dumps(result)
+                'body': _dumps(result)
             }
         
         else:
             return {
                 'statusCode': 400,
-                'body': json.dumps({'error': f'Unknown action: {action}'})
+                'body': _dumps({'error': f'Unknown action: {action}'})
             }
     
     except Exception as e:
         logger.error(f"Handler error: {e}")
         return {
             'statusCode': 500,
-            'body': json.dumps({'error': str(e)})
+            'body': _dumps({'error': str(e)})
         }
 
 
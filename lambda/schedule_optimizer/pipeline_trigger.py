@@ -8,11 +8,16 @@ All configuration is loaded from config/pipeline_config.py
 """
 
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
 import json
 import logging
+import threading
 import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from datetime import datetime, timedelta
-from typing import Dict, Optional, Tuple
+from typing import Any, Callable, Dict, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import sys
@@ -38,6 +43,19 @@ from config.pipeline_config import (
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Config comes from environment variables, which are fixed for the lifetime of
+# a Lambda container, so the values used on every trigger are read once here.
+_DEFAULT_REGION = AWS_CONFIG["default_region"]
+_PIPELINE_CONFIGURED = bool(is_pipeline_configured())
+_MAX_RETRIES = max(1, SCHEDULING_CONFIG["max_retries"])
+_CB_SOURCE_VERSION = CODEBUILD_CONFIG["source_version"]
+_CB_ENV_VARS = CODEBUILD_CONFIG["environment_variables"]
+# Override list for the configured build variables, used as-is when the
+# caller adds none of its own
+_CB_ENV_TEMPLATE = tuple(
+    {"name": k, "value": v, "type": "PLAINTEXT"} for k, v in _CB_ENV_VARS.items()
+)
+
 
 # ============================================================================
 # CUSTOM EXCEPTIONS
@@ -81,7 +99,7 @@ class TriggerStatus(Enum):
     NOT_CONFIGURED = "not_configured"
 
 
-@dataclass
+@dataclass(slots=True)
 class TriggerResult:
     """Result of a pipeline trigger operation."""
     status: TriggerStatus
@@ -91,29 +109,58 @@ class TriggerResult:
     scheduled_time: Optional[str] = None
     error: Optional[str] = None
     
-    def to_dict(self) -> Dict:
+    def to_dict(self, timestamp: Optional[str] = None) -> Dict:
+        """
+        Serialize for API responses; optional fields are only included when set.
+        
+        Args:
+            timestamp: ISO timestamp to report; the current time if not supplied
+        """
         result = {
             "status": self.status.value,
             "service": self.service,
             "message": self.message,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": timestamp or datetime.utcnow().isoformat(),
         }
-        if self.execution_id:
-            result["execution_id"] = self.execution_id
-        if self.scheduled_time:
-            result["scheduled_time"] = self.scheduled_time
-        if self.error:
-            result["error"] = self.error
+        for key in _TRIGGER_RESULT_OPTIONAL_FIELDS:
+            value = getattr(self, key)
+            if value:
+                result[key] = value
         return result
 
 
+_TRIGGER_RESULT_OPTIONAL_FIELDS = ("execution_id", "scheduled_time", "error")
+
+
 # ============================================================================
 # AWS CLIENT FACTORY
 # ============================================================================
 
+# Clients per (service, region), reused across warm invocations. Creating one
+# loads the service model, which costs far more than the API call it makes.
+# boto3 clients are thread-safe once built, but building them through the
+# default session is not, hence the lock.
+_CLIENT_CACHE: Dict[Tuple[str, str], Any] = {}
+_CLIENT_CACHE_LOCK = threading.Lock()
+
+# Keep-alive lets warm invocations reuse the TCP+TLS connection instead of
+# paying a fresh handshake per trigger. Timeouts are short because a stuck
+# call is better retried than waited on. Adaptive mode retries throttling,
+# 5xx and connection errors with jittered exponential backoff, and
+# rate-limits the client itself while the service is throttling it;
+# deterministic errors are raised on the first attempt.
+_CLIENT_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=50,
+    connect_timeout=3,
+    read_timeout=10,
+    retries={"total_max_attempts": _MAX_RETRIES, "mode": "adaptive"},
+)
+
+
 def get_aws_client(service_name: str, region: str = None):
     """
-    Create AWS client with proper error handling.
+    Get a cached AWS client, creating it on first use.
     
     Args:
         service_name: AWS service name (codepipeline, codebuild, etc.)
@@ -127,16 +174,98 @@ def get_aws_client(service_name: str, region: str = None):
     """
     try:
         # Use provided region, or fall back to default
-        target_region = region or AWS_CONFIG["default_region"]
-        return boto3.client(
-            service_name,
-            region_name=target_region
-        )
+        target_region = region or _DEFAULT_REGION
+        key = (service_name, target_region)
+        client = _CLIENT_CACHE.get(key)
+        if client is None:
+            with _CLIENT_CACHE_LOCK:
+                client = _CLIENT_CACHE.get(key)
+                if client is None:
+                    client = _CLIENT_CACHE[key] = boto3.client(
+                        service_name,
+                        region_name=target_region,
+                        config=_CLIENT_CONFIG
+                    )
+        return client
     except Exception as e:
         logger.error(f"Failed to create {service_name} client in {region}: {e}")
         raise AWSClientError(f"Failed to create {service_name} client: {e}")
 
 
+# ============================================================================
+# TRIGGER CALLS
+# ============================================================================
+
+def _call_trigger_api(
+    service: str,
+    label: str,
+    region: str,
+    op_name: str,
+    params: Dict,
+    *,
+    execution_id: Callable[[Dict], Optional[str]],
+    success_message: str,
+    failure_message: str,
+    terminal_exc_map: Dict[str, Tuple[TriggerStatus, str]]
+) -> TriggerResult:
+    """
+    Make one trigger API call and turn the outcome into a TriggerResult.
+    
+    Transient failures are retried by botocore (see _CLIENT_CONFIG), so any
+    exception that reaches here is final.
+    
+    Args:
+        service: boto3 service name
+        label: Service name reported in the result
+        region: AWS region to call
+        op_name: Client method to call
+        params: Keyword arguments for the call
+        execution_id: Pulls the execution/build id out of the response
+        success_message: Result message on success
+        failure_message: Result message for unexpected failures
+        terminal_exc_map: Modeled client exception names (which are also their
+            error codes) mapped to the status and message to report for them
+    
+    Returns:
+        TriggerResult with execution details
+    """
+    try:
+        client = get_aws_client(service, region=region)
+        response = getattr(client, op_name)(**params)
+    except Exception as e:
+        code = e.response.get("Error", {}).get("Code") if isinstance(e, ClientError) else None
+        terminal = terminal_exc_map.get(code)
+        if terminal:
+            status, message = terminal
+            return TriggerResult(status=status, service=label, message=message, error=str(e))
+        logger.error(f"{label} trigger failed: {e}")
+        return TriggerResult(
+            status=TriggerStatus.FAILED,
+            service=label,
+            message=failure_message,
+            error=str(e)
+        )
+    
+    exec_id = execution_id(response)
+    logger.info(f"{label}: {success_message}: {exec_id}")
+    
+    return TriggerResult(
+        status=TriggerStatus.SUCCESS,
+        service=label,
+        message=success_message,
+        execution_id=exec_id
+    )
+
+
+def _exec_name(prefix: str) -> str:
+    """
+    Unique execution/schedule name. Nanoseconds rather than a seconds-resolution
+    timestamp, so two triggers in the same second don't collide and come back
+    as ExecutionAlreadyExists.
+    """
+    return f"{prefix}-{time.time_ns()}"
+
+
 # ============================================================================
 # CODEPIPELINE TRIGGER
 # ============================================================================
@@ -176,60 +305,21 @@ def trigger_codepipeline(
             error="CODEPIPELINE_NAME environment variable not set"
         )
     
-    # Retry logic
-    max_retries = SCHEDULING_CONFIG["max_retries"]
-    retry_delay = SCHEDULING_CONFIG["retry_delay_seconds"]
-    last_error = None
-    target_region = region or AWS_CONFIG["default_region"]
-    
-    for attempt in range(max_retries):
-        try:
-            client = get_aws_client("codepipeline", region=target_region)
-            
-            params = {"name": name}
-            if client_request_token:
-                params["clientRequestToken"] = client_request_token
-            
-            response = client.start_pipeline_execution(**params)
-            execution_id = response.get("pipelineExecutionId")
-            
-            logger.info(f"CodePipeline '{name}' triggered in {target_region}: {execution_id}")
-            
-            return TriggerResult(
-                status=TriggerStatus.SUCCESS,
-                service="CodePipeline",
-                message=f"Pipeline '{name}' triggered in {target_region}",
-                execution_id=execution_id
-            )
-            
-        except client.exceptions.PipelineNotFoundException:
-            return TriggerResult(
-                status=TriggerStatus.FAILED,
-                service="CodePipeline",
-                message=f"Pipeline '{name}' not found",
-                error="PipelineNotFoundException"
-            )
-            
-        except client.exceptions.ConflictException as e:
+    target_region = region or _DEFAULT_REGION
+    params = {"name": name}
+    if client_request_token:
+        params["clientRequestToken"] = client_request_token
+    
+    return _call_trigger_api(
+        "codepipeline", "CodePipeline", target_region, "start_pipeline_execution", params,
+        execution_id=lambda r: r.get("pipelineExecutionId"),
+        success_message=f"Pipeline '{name}' triggered in {target_region}",
+        failure_message=f"Failed to trigger pipeline '{name}'",
+        terminal_exc_map={
+            "PipelineNotFoundException": (TriggerStatus.FAILED, f"Pipeline '{name}' not found"),
             # Pipeline already running
-            return TriggerResult(
-                status=TriggerStatus.SKIPPED,
-                service="CodePipeline",
-                message=f"Pipeline '{name}' is already running",
-                error=str(e)
-            )
-            
-        except Exception as e:
-            last_error = str(e)
-            logger.warning(f"CodePipeline trigger attempt {attempt + 1} failed: {e}")
-            if attempt < max_retries - 1:
-                time.sleep(retry_delay)
-    
-    return TriggerResult(
-        status=TriggerStatus.FAILED,
-        service="CodePipeline",
-        message=f"Failed to trigger pipeline '{name}' after {max_retries} attempts",
-        error=last_error
+            "ConflictException": (TriggerStatus.SKIPPED, f"Pipeline '{name}' is already running"),
+        }
     )
 
 
@@ -274,72 +364,35 @@ def trigger_codebuild(
             error="CODEBUILD_PROJECT environment variable not set"
         )
     
-    max_retries = SCHEDULING_CONFIG["max_retries"]
-    retry_delay = SCHEDULING_CONFIG["retry_delay_seconds"]
-    last_error = None
-    target_region = region or AWS_CONFIG["default_region"]
-    
-    for attempt in range(max_retries):
-        try:
-            client = get_aws_client("codebuild", region=target_region)
-            
-            params = {"projectName": name}
-            
-            # Source version
-            version = source_version or CODEBUILD_CONFIG["source_version"]
-            if version:
-                params["sourceVersion"] = version
-            
-            # Environment variables
-            env_vars = {**CODEBUILD_CONFIG["environment_variables"]}
-            if environment_variables:
-                env_vars.update(environment_variables)
-            
-            if env_vars:
-                params["environmentVariablesOverride"] = [
-                    {"name": k, "value": v, "type": "PLAINTEXT"}
-                    for k, v in env_vars.items()
-                ]
-            
-            response = client.start_build(**params)
-            build_id = response.get("build", {}).get("id")
-            
-            logger.info(f"CodeBuild '{name}' triggered in {target_region}: {build_id}")
-            
-            return TriggerResult(
-                status=TriggerStatus.SUCCESS,
-                service="CodeBuild",
-                message=f"Build project '{name}' triggered in {target_region}",
-                execution_id=build_id
-            )
-            
-        except client.exceptions.ResourceNotFoundException:
-            return TriggerResult(
-                status=TriggerStatus.FAILED,
-                service="CodeBuild",
-                message=f"Build project '{name}' not found",
-                error="ResourceNotFoundException"
-            )
-            
-        except client.exceptions.AccountLimitExceededException as e:
-            return TriggerResult(
-                status=TriggerStatus.FAILED,
-                service="CodeBuild",
-                message="Account build limit exceeded",
-                error=str(e)
-            )
-            
-        except Exception as e:
-            last_error = str(e)
-            logger.warning(f"CodeBuild trigger attempt {attempt + 1} failed: {e}")
-            if attempt < max_retries - 1:
-                time.sleep(retry_delay)
-    
-    return TriggerResult(
-        status=TriggerStatus.FAILED,
-        service="CodeBuild",
-        message=f"Failed to trigger build '{name}' after {max_retries} attempts",
-        error=last_error
+    target_region = region or _DEFAULT_REGION
+    # botocore retries read timeouts, and start_build does not fill in an
+    # idempotency token itself: without one, a slow response that gets
+    # retried starts a second build
+    params = {"projectName": name, "idempotencyToken": str(uuid.uuid4())}
+    
+    # Source version
+    version = source_version or _CB_SOURCE_VERSION
+    if version:
+        params["sourceVersion"] = version
+    
+    # Environment variables; caller values win over the configured ones
+    if environment_variables:
+        params["environmentVariablesOverride"] = [
+            {"name": k, "value": v, "type": "PLAINTEXT"}
+            for k, v in {**_CB_ENV_VARS, **environment_variables}.items()
+        ]
+    elif _CB_ENV_TEMPLATE:
+        params["environmentVariablesOverride"] = list(_CB_ENV_TEMPLATE)
+    
+    return _call_trigger_api(
+        "codebuild", "CodeBuild", target_region, "start_build", params,
+        execution_id=lambda r: r.get("build", {}).get("id"),
+        success_message=f"Build project '{name}' triggered in {target_region}",
+        failure_message=f"Failed to trigger build '{name}'",
+        terminal_exc_map={
+            "ResourceNotFoundException": (TriggerStatus.FAILED, f"Build project '{name}' not found"),
+            "AccountLimitExceededException": (TriggerStatus.FAILED, "Account build limit exceeded"),
+        }
     )
 
 
@@ -384,65 +437,26 @@ def trigger_stepfunctions(
             error="STEPFUNCTIONS_ARN environment variable not set"
         )
     
-    max_retries = SCHEDULING_CONFIG["max_retries"]
-    retry_delay = SCHEDULING_CONFIG["retry_delay_seconds"]
-    last_error = None
-    target_region = region or AWS_CONFIG["default_region"]
+    target_region = region or _DEFAULT_REGION
+    params = {"stateMachineArn": arn}
     
-    for attempt in range(max_retries):
-        try:
-            client = get_aws_client("stepfunctions", region=target_region)
-            
-            params = {"stateMachineArn": arn}
-            
-            if input_data:
-                params["input"] = json.dumps(input_data)
-            
-            if execution_name:
-                params["name"] = execution_name
-            else:
-                # Generate unique name
-                params["name"] = f"green-qa-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}"
-            
-            response = client.start_execution(**params)
-            execution_arn = response.get("executionArn")
-            
-            logger.info(f"Step Functions execution started in {target_region}: {execution_arn}")
-            
-            return TriggerResult(
-                status=TriggerStatus.SUCCESS,
-                service="StepFunctions",
-                message=f"State machine execution started in {target_region}",
-                execution_id=execution_arn
-            )
-            
-        except client.exceptions.StateMachineDoesNotExist:
-            return TriggerResult(
-                status=TriggerStatus.FAILED,
-                service="StepFunctions",
-                message="State machine not found",
-                error="StateMachineDoesNotExist"
-            )
-            
-        except client.exceptions.ExecutionAlreadyExists as e:
-            return TriggerResult(
-                status=TriggerStatus.SKIPPED,
-                service="StepFunctions",
-                message="Execution with this name already exists",
-                error=str(e)
-            )
-            
-        except Exception as e:
-            last_error = str(e)
-            logger.warning(f"Step Functions trigger attempt {attempt + 1} failed: {e}")
-            if attempt < max_retries - 1:
-                time.sleep(retry_delay)
+    if input_data:
+        params["input"] = json.dumps(input_data)
     
-    return TriggerResult(
-        status=TriggerStatus.FAILED,
-        service="StepFunctions",
-        message=f"Failed to start execution after {max_retries} attempts",
-        error=last_error
+    if execution_name:
+        params["name"] = execution_name
+    else:
+        params["name"] = _exec_name("green-qa")
+    
+    return _call_trigger_api(
+        "stepfunctions", "StepFunctions", target_region, "start_execution", params,
+        execution_id=lambda r: r.get("executionArn"),
+        success_message=f"State machine execution started in {target_region}",
+        failure_message="Failed to start execution",
+        terminal_exc_map={
+            "StateMachineDoesNotExist": (TriggerStatus.FAILED, "State machine not found"),
+            "ExecutionAlreadyExists": (TriggerStatus.SKIPPED, "Execution with this name already exists"),
+        }
     )
 
 
@@ -450,6 +464,14 @@ def trigger_stepfunctions(
 # EVENTBRIDGE SCHEDULER (For DEFER recommendations)
 # ============================================================================
 
+# Target input for deferred runs. Only the pipeline, region and time vary, so
+# they are JSON-encoded individually into a fixed template laid out exactly as
+# json.dumps would lay out the full dict.
+_EB_INPUT_TEMPLATE = (
+    '{"action": "trigger_pipeline", "pipeline_name": %s, "region": %s, '
+    '"scheduled_by": "green-qa-defer", "original_schedule_time": %s}'
+)
+
 def schedule_pipeline_execution(
     scheduled_time: datetime,
     pipeline_name: str = None,
@@ -490,13 +512,13 @@ def schedule_pipeline_execution(
         )
     
     name = pipeline_name or get_pipeline_name(workload_type)
-    target_region = region or AWS_CONFIG["default_region"]
+    target_region = region or _DEFAULT_REGION
     
     try:
         client = get_aws_client("scheduler", region=target_region)
         
         # Generate schedule name
-        sched_name = schedule_name or f"green-qa-defer-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
+        sched_name = schedule_name or _exec_name("green-qa-defer")
         
         # Schedule expression (one-time)
         schedule_expression = f"at({scheduled_time.strftime('%Y-%m-%dT%H:%M:%S')})"
@@ -510,13 +532,11 @@ def schedule_pipeline_execution(
             "Target": {
                 "Arn": target_arn,
                 "RoleArn": role_arn,
-                "Input": json.dumps({
-                    "action": "trigger_pipeline",
-                    "pipeline_name": name,
-                    "region": target_region,
-                    "scheduled_by": "green-qa-defer",
-                    "original_schedule_time": scheduled_time.isoformat(),
-                }),
+                "Input": _EB_INPUT_TEMPLATE % (
+                    json.dumps(name),
+                    json.dumps(target_region),
+                    json.dumps(scheduled_time.isoformat()),
+                ),
             },
             "ActionAfterCompletion": "DELETE",  # One-time schedule
         }
@@ -548,6 +568,23 @@ def schedule_pipeline_execution(
 # SNS NOTIFICATIONS
 # ============================================================================
 
+# SNS publishes run off the request path. A notification never changes the
+# trigger result, so callers overlap it with whatever else they do, but wait
+# for it (bounded) before returning: Lambda freezes the container once the
+# handler returns, and a publish left in flight would be lost or go out
+# during a later invocation.
+_NOTIFICATION_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+NOTIFICATION_WAIT_SECONDS = 2
+
+
+def _wait_for_notification(future: Future) -> None:
+    """Wait up to NOTIFICATION_WAIT_SECONDS for a submitted notification."""
+    try:
+        future.result(timeout=NOTIFICATION_WAIT_SECONDS)
+    except FuturesTimeoutError:
+        logger.warning(f"Notification still pending after {NOTIFICATION_WAIT_SECONDS}s")
+
+
 def send_notification(
     subject: str,
     message: str,
@@ -597,6 +634,42 @@ def send_notification(
 # MAIN TRIGGER FUNCTION (Called by Schedule Optimizer)
 # ============================================================================
 
+# Services to run a pipeline on, in order of preference, limited to the ones
+# enabled in config: (trigger function, whether it takes input_data)
+_TRIGGER_CHAIN = tuple(
+    (trigger, takes_input)
+    for config, trigger, takes_input in (
+        (CODEPIPELINE_CONFIG, trigger_codepipeline, False),
+        (CODEBUILD_CONFIG, trigger_codebuild, False),
+        (STEPFUNCTIONS_CONFIG, trigger_stepfunctions, True),
+    )
+    if config["enabled"]
+)
+
+
+def _trigger_first_enabled(
+    workload_type: str,
+    region: str,
+    input_data: Dict = None
+) -> TriggerResult:
+    """
+    Trigger the pipeline on the first enabled service.
+    
+    Step Functions needs an input document, so it is only considered when
+    input_data is given.
+    """
+    for trigger, takes_input in _TRIGGER_CHAIN:
+        if not takes_input:
+            return trigger(workload_type=workload_type, region=region)
+        if input_data is not None:
+            return trigger(workload_type=workload_type, region=region, input_data=input_data)
+    return TriggerResult(
+        status=TriggerStatus.NOT_CONFIGURED,
+        service="None",
+        message="No pipeline service enabled"
+    )
+
+
 def execute_pipeline_action(
     recommendation: str,
     region: str,
@@ -624,7 +697,7 @@ def execute_pipeline_action(
     logger.info(f"Executing pipeline action: {recommendation} for {workload_type or 'default'}")
     
     # Check if any pipeline is configured
-    if not is_pipeline_configured():
+    if not _PIPELINE_CONFIGURED:
         return TriggerResult(
             status=TriggerStatus.NOT_CONFIGURED,
             service="None",
@@ -643,30 +716,20 @@ def execute_pipeline_action(
         
         # Try CodePipeline first, then CodeBuild, then Step Functions
         # Region is passed from the scheduling decision
-        if CODEPIPELINE_CONFIG["enabled"]:
-            result = trigger_codepipeline(workload_type=workload_type, region=region)
-        elif CODEBUILD_CONFIG["enabled"]:
-            result = trigger_codebuild(workload_type=workload_type, region=region)
-        elif STEPFUNCTIONS_CONFIG["enabled"]:
-            result = trigger_stepfunctions(
-                workload_type=workload_type,
-                region=region,
-                input_data={
-                    "region": region,
-                    "carbon_intensity": carbon_intensity,
-                    "triggered_by": "green-qa-run-now"
-                }
-            )
-        else:
-            result = TriggerResult(
-                status=TriggerStatus.NOT_CONFIGURED,
-                service="None",
-                message="No pipeline service enabled"
-            )
+        result = _trigger_first_enabled(
+            workload_type,
+            region,
+            input_data={
+                "region": region,
+                "carbon_intensity": carbon_intensity,
+                "triggered_by": "green-qa-run-now"
+            }
+        )
         
         # Send notification
         if result.status == TriggerStatus.SUCCESS:
-            send_notification(
+            notification = _NOTIFICATION_EXECUTOR.submit(
+                send_notification,
                 subject=f"[Green QA] Pipeline Triggered - {region}",
                 message=f"Pipeline triggered for {workload_type or 'default'} workload.\n"
                         f"Region: {region}\n"
@@ -674,6 +737,7 @@ def execute_pipeline_action(
                         f"Execution ID: {result.execution_id}",
                 event_type="pipeline_triggered"
             )
+            _wait_for_notification(notification)
         
         return result
     
@@ -712,7 +776,8 @@ def execute_pipeline_action(
         
         # Send notification
         if result.status == TriggerStatus.SCHEDULED:
-            send_notification(
+            notification = _NOTIFICATION_EXECUTOR.submit(
+                send_notification,
                 subject=f"[Green QA] Pipeline Scheduled - {region}",
                 message=f"Pipeline scheduled for {workload_type or 'default'} workload.\n"
                         f"Scheduled Time: {scheduled_time.isoformat()}\n"
@@ -720,6 +785,7 @@ def execute_pipeline_action(
                         f"Current Intensity: {carbon_intensity} gCO2/kWh",
                 event_type="pipeline_scheduled"
             )
+            _wait_for_notification(notification)
         
         return result
     
@@ -732,8 +798,9 @@ def execute_pipeline_action(
                 message="Auto-trigger is disabled"
             )
         
-        # Send high carbon warning
-        send_notification(
+        # Send high carbon warning while the pipeline is being triggered
+        warning = _NOTIFICATION_EXECUTOR.submit(
+            send_notification,
             subject=f"[Green QA] ⚠️ High Carbon Warning - {region}",
             message=f"Pipeline triggered during HIGH carbon intensity period.\n"
                     f"Region: {region}\n"
@@ -743,16 +810,13 @@ def execute_pipeline_action(
         )
         
         # Still trigger the pipeline in the specified region
-        if CODEPIPELINE_CONFIG["enabled"]:
-            return trigger_codepipeline(workload_type=workload_type, region=region)
-        elif CODEBUILD_CONFIG["enabled"]:
-            return trigger_codebuild(workload_type=workload_type, region=region)
-        else:
-            return TriggerResult(
-                status=TriggerStatus.NOT_CONFIGURED,
-                service="None",
-                message="No pipeline service enabled"
-            )
+        # (CodePipeline or CodeBuild only)
+        result = _trigger_first_enabled(workload_type, region)
+        
+        # The warning is the point of this branch, so don't let the
+        # container freeze before it has gone out
+        _wait_for_notification(warning)
+        return result
     
     elif recommendation == "relocate":
         # Trigger pipeline in the optimal (alternative) region for carbon savings
@@ -765,31 +829,21 @@ def execute_pipeline_action(
         
         # Use the optimal region passed from scheduler for triggering
         # This enables actual carbon savings through geographic load shifting
-        if CODEPIPELINE_CONFIG["enabled"]:
-            result = trigger_codepipeline(workload_type=workload_type, region=region)
-        elif CODEBUILD_CONFIG["enabled"]:
-            result = trigger_codebuild(workload_type=workload_type, region=region)
-        elif STEPFUNCTIONS_CONFIG["enabled"]:
-            result = trigger_stepfunctions(
-                workload_type=workload_type,
-                region=region,
-                input_data={
-                    "region": region,
-                    "carbon_intensity": carbon_intensity,
-                    "triggered_by": "green-qa-relocate",
-                    "estimated_savings_percent": estimated_savings
-                }
-            )
-        else:
-            return TriggerResult(
-                status=TriggerStatus.NOT_CONFIGURED,
-                service="None",
-                message="No pipeline service enabled"
-            )
+        result = _trigger_first_enabled(
+            workload_type,
+            region,
+            input_data={
+                "region": region,
+                "carbon_intensity": carbon_intensity,
+                "triggered_by": "green-qa-relocate",
+                "estimated_savings_percent": estimated_savings
+            }
+        )
         
         # Send notification about relocation
         if result.status == TriggerStatus.SUCCESS:
-            send_notification(
+            notification = _NOTIFICATION_EXECUTOR.submit(
+                send_notification,
                 subject=f"[Green QA] Pipeline Relocated to {region}",
                 message=f"Pipeline triggered in optimal region for carbon savings.\n"
                         f"Region: {region}\n"
@@ -798,6 +852,7 @@ def execute_pipeline_action(
                         f"Execution ID: {result.execution_id}",
                 event_type="pipeline_triggered"
             )
+            _wait_for_notification(notification)
         
         return result
     
@@ -0,0 +1,163 @@
+"""
+Tests for horizon recommendations
+
+Covers:
+- Edge cases (no forecast, fewer slots than the workload, no deferral allowed)
+- Agreement with a per-slot find_optimal_window scan
+- The get_horizon Lambda action
+"""
+
+import importlib.util
+import json
+import os
+import random
+import sys
+from array import array
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+# Loaded under its own name: lambda/api also has a handler module
+_spec = importlib.util.spec_from_file_location(
+    'schedule_optimizer_handler',
+    os.path.join(os.path.dirname(__file__), 'handler.py')
+)
+handler = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(handler)
+
+
+def make_forecast(intensities):
+    """Forecast in the parallel-sequence form get_carbon_data returns."""
+    return {
+        'from': [f'slot-{i}-from' for i in range(len(intensities))],
+        'to': [f'slot-{i}-to' for i in range(len(intensities))],
+        'intensity': array('d', intensities)
+    }
+
+
+def per_slot_recommendation(forecast, t, duration_minutes, max_defer_hours):
+    """Reference: the same decision made with a find_optimal_window scan from slot t."""
+    current = forecast['intensity'][t]
+    current_index = handler.get_carbon_index(current)
+    entry = {
+        'from': forecast['from'][t],
+        'current_intensity': current,
+        'current_index': current_index
+    }
+    if current_index in handler._LOW_INDICES:
+        entry['recommendation'] = handler.RecommendationType.RUN_NOW.value
+        return entry
+
+    remaining = {key: values[t:] for key, values in forecast.items()}
+    window = handler.find_optimal_window(remaining, duration_minutes, max_defer_hours)
+    if window and current > 0:
+        improvement = (current - window.carbon_intensity) / current
+        if improvement >= handler.DEFER_BENEFIT_THRESHOLD:
+            entry['recommendation'] = handler.RecommendationType.DEFER.value
+            entry['optimal_start'] = window.start_time
+            entry['optimal_end'] = window.end_time
+            entry['optimal_intensity'] = window.carbon_intensity
+            entry['estimated_savings_percent'] = round(improvement * 100, 1)
+            return entry
+
+    entry['recommendation'] = (
+        handler.RecommendationType.RUN_WITH_WARNING.value if current_index in handler._HIGH_INDICES
+        else handler.RecommendationType.RUN_NOW.value
+    )
+    return entry
+
+
+class TestHorizonEdgeCases:
+    """Inputs with nothing, or nothing reachable, to defer to"""
+
+    def test_no_forecast(self):
+        """No forecast gives an empty horizon"""
+        assert handler.get_horizon_recommendations(None) == []
+        assert handler.get_horizon_recommendations({}) == []
+
+    def test_empty_forecast(self):
+        """A forecast with no slots gives an empty horizon"""
+        assert handler.get_horizon_recommendations(make_forecast([])) == []
+
+    def test_fewer_slots_than_needed(self):
+        """With no complete window every slot is decided on its own intensity"""
+        forecast = make_forecast([450.0, 20.0, 450.0])
+
+        horizon = handler.get_horizon_recommendations(forecast, duration_minutes=240)
+
+        assert len(horizon) == 3
+        assert [e['recommendation'] for e in horizon] == [
+            handler.RecommendationType.RUN_WITH_WARNING.value,
+            handler.RecommendationType.RUN_NOW.value,
+            handler.RecommendationType.RUN_WITH_WARNING.value,
+        ]
+        assert not any('optimal_start' in e for e in horizon)
+
+    def test_no_defer_window(self):
+        """max_defer_hours=0 never defers, however good a later slot is"""
+        forecast = make_forecast([450.0, 20.0, 20.0, 450.0])
+
+        horizon = handler.get_horizon_recommendations(forecast, max_defer_hours=0)
+
+        assert all(e['recommendation'] != handler.RecommendationType.DEFER.value for e in horizon)
+        assert horizon[0]['recommendation'] == handler.RecommendationType.RUN_WITH_WARNING.value
+
+
+class TestHorizonMatchesPerSlotScan:
+    """The sliding-minimum pass agrees with a find_optimal_window scan per slot"""
+
+    def test_defers_to_later_low_window(self):
+        """A high slot defers to the earliest lowest reachable window"""
+        forecast = make_forecast([450.0, 400.0, 100.0, 100.0, 300.0])
+
+        horizon = handler.get_horizon_recommendations(forecast, duration_minutes=60)
+
+        assert horizon[0]['recommendation'] == handler.RecommendationType.DEFER.value
+        assert horizon[0]['optimal_start'] == 'slot-2-from'
+        assert horizon[0]['optimal_end'] == 'slot-3-to'
+        assert horizon[0]['optimal_intensity'] == pytest.approx(100.0)
+
+    @pytest.mark.parametrize('duration_minutes', [30, 60, 90, 180])
+    @pytest.mark.parametrize('max_defer_hours', [0, 1, 3, 24])
+    def test_random_forecasts(self, duration_minutes, max_defer_hours):
+        """Randomised forecasts, including ties, match slot for slot"""
+        rng = random.Random(duration_minutes * 100 + max_defer_hours)
+        for _ in range(25):
+            # Whole numbers keep window sums exact, so ties resolve identically
+            length = rng.randint(0, 60)
+            forecast = make_forecast([float(rng.choice((0, 40, 120, 180, 260, 400, 500)) + rng.randint(0, 3))
+                                      for _ in range(length)])
+
+            horizon = handler.get_horizon_recommendations(forecast, duration_minutes, max_defer_hours)
+
+            expected = [per_slot_recommendation(forecast, t, duration_minutes, max_defer_hours)
+                        for t in range(length)]
+            assert horizon == expected
+
+
+class TestHorizonAction:
+    """The get_horizon Lambda action"""
+
+    def test_get_horizon_action(self, monkeypatch):
+        """The action runs the region's forecast through get_horizon_recommendations"""
+        forecast = make_forecast([450.0, 100.0])
+        monkeypatch.setattr(handler, 'get_carbon_data', lambda region: {'forecast': forecast})
+
+        response = handler.lambda_handler(
+            {'action': 'get_horizon', 'region': 'eu-west-2', 'max_defer_hours': 1}, None
+        )
+
+        assert response['statusCode'] == 200
+        body = json.loads(response['body'])
+        assert body['region'] == 'eu-west-2'
+        assert body['horizon'] == handler.get_horizon_recommendations(forecast, 30, 1)
+
+    def test_get_horizon_action_without_data(self, monkeypatch):
+        """A region with no data gives an empty horizon"""
+        monkeypatch.setattr(handler, 'get_carbon_data', lambda region: None)
+
+        response = handler.lambda_handler({'action': 'get_horizon'}, None)
+
+        assert response['statusCode'] == 200
+        assert json.loads(response['body'])['horizon'] == []